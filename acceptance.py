@@ -0,0 +1,139 @@
+#! /usr/bin/env python3
+
+'''
+acceptance.py is a python module with an acceptance map, a lookup table of the fraction of events that are
+reconstructed binned in one or more kinematic variables of the event (ie the 3 pion mass and cos(theta)). the
+acceptance of every event is looked up all at once with np.digitize (or straight from the bin width for evenly
+spaced bins) and fancy indexing, and its inverse is used as the event weight to correct the histograms for the
+acceptance (see histogram.WeightedHistogram1D)
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import numpy as np
+
+
+class AcceptanceMap:
+    '''
+        acceptance binned in the kinematic variables of the events
+        names (list of strings): names of the variables, used to find them in a dictionary of columns
+        edges (list of 1-d arrays of floats): bin edges of each variable
+        values (array of floats): acceptance of every bin, with one axis per variable
+    '''
+
+    def __init__(self, names, edges, values):
+        self.names = list(names)
+        self.edges = [np.asarray(axisEdges, dtype=np.float64) for axisEdges in edges]
+        self.values = np.asarray(values, dtype=np.float64)
+
+        if self.values.shape != tuple(len(axisEdges) - 1 for axisEdges in self.edges):
+            raise ValueError('acceptance values with shape %s do not match the bin edges' % (self.values.shape,))
+
+        # whether the bins of each variable are evenly spaced
+        self.uniform = [np.allclose(np.diff(axisEdges), (axisEdges[-1] - axisEdges[0]) / (len(axisEdges) - 1))
+                        for axisEdges in self.edges]
+
+    @classmethod
+    def fromCounts(cls, names, edges, accepted, generated):
+        '''
+            makes the map from the number of generated events and the number of them that were reconstructed in
+            every bin, ie from Monte Carlo. bins without generated events get an acceptance of 0
+        '''
+
+        accepted = np.asarray(accepted, dtype=np.float64)
+        generated = np.asarray(generated, dtype=np.float64)
+        values = np.divide(accepted, generated, out=np.zeros_like(accepted), where=generated > 0)
+
+        return cls(names, edges, values)
+
+    def axisIndex(self, axis, values):
+        '''
+            bin of every value along one variable, -1 below the first edge and the number of bins at or above the last
+            edge, the same as np.digitize(values, edges) - 1. evenly spaced bins are found directly from the bin width
+            instead of searching the edges
+        '''
+
+        axisEdges = self.edges[axis]
+        if not self.uniform[axis]:
+            return np.digitize(values, axisEdges) - 1
+
+        width = (axisEdges[-1] - axisEdges[0]) / (len(axisEdges) - 1)
+        index = np.floor((values - axisEdges[0]) / width)
+        np.clip(index, -1, len(axisEdges) - 1, out=index)
+
+        # np.digitize puts nan after the last edge, so it is outside the map the same way
+        isNumber = ~np.isnan(values)
+        index[~isNumber] = len(axisEdges) - 1
+        index = index.astype(np.intp)
+
+        # rounding can put a value right at an edge into the bin next to it, those are moved back so the bins match
+        # np.digitize exactly
+        padded = np.concatenate([[-np.inf], axisEdges, [np.inf]])
+        index -= isNumber & (values < padded[index + 1])
+        index += isNumber & (values >= padded[index + 2]) & (index < len(axisEdges) - 1)
+
+        return index
+
+    def binIndex(self, coordinates):
+        '''
+            finds the bin of every event in the flattened map
+            input:
+                coordinates (list of 1-d arrays of floats): values of each variable for every event
+            returns:
+                array of ints with the index of each event in self.values.ravel(), and a boolean array that is True
+                for the events that are inside the map
+        '''
+
+        flat = np.zeros(len(coordinates[0]), dtype=np.intp)
+        inside = np.ones(len(coordinates[0]), dtype=bool)
+        for axis, values in enumerate(coordinates):
+            numBins = len(self.edges[axis]) - 1
+            index = self.axisIndex(axis, values)
+            inside &= (index >= 0) & (index < numBins)
+            flat *= numBins
+            flat += np.clip(index, 0, numBins - 1)
+
+        return flat, inside
+
+    def lookup(self, columns):
+        '''
+            acceptance of every event, 0 for events outside the map
+            input:
+                columns (dictionary or DataFrame): column name to array of values, has every variable in names
+            returns:
+                1-d array of floats
+        '''
+
+        flat, inside = self.binIndex([np.asarray(columns[name], dtype=np.float64) for name in self.names])
+        acceptance = self.values.ravel()[flat]
+        acceptance[~inside] = 0.0
+
+        return acceptance
+
+    def weights(self, columns, minimum=1e-3):
+        '''
+            acceptance correction of every event, 1 / acceptance. events where the acceptance is below minimum (or
+            outside the map) get a weight of 0 instead of a huge weight
+            input:
+                columns (dictionary or DataFrame): column name to array of values, has every variable in names
+                minimum (float): smallest acceptance that is corrected
+            returns:
+                1-d array of floats
+        '''
+
+        acceptance = self.lookup(columns)
+
+        return np.divide(1.0, acceptance, out=np.zeros_like(acceptance), where=acceptance >= minimum)
+
+    def save(self, fileName):
+        arrays = {'edges%d' % i: axisEdges for i, axisEdges in enumerate(self.edges)}
+        np.savez(fileName, names=np.array(self.names), values=self.values, **arrays)
+
+    @classmethod
+    def load(cls, fileName):
+        with np.load(fileName) as arrays:
+            names = [str(name) for name in arrays['names']]
+            edges = [arrays['edges%d' % i] for i in range(len(names))]
+            return cls(names, edges, arrays['values'])
@@ -0,0 +1,124 @@
+#! /usr/bin/env python3
+
+'''
+columnStore.py is a python module that saves the results of an analysis (the particles and every derived column
+like the invariant masses) to one compressed columnar file, and loads back only the columns a study asks for. the
+file is Parquet when pyarrow is installed, otherwise a compressed numpy .npz file, which can also read one column
+at a time. the particle IDs and charges are stored as integers instead of text or floats
+
+usage:
+    python columnStore.py n3pi_results.parquet [column1 column2 ...]
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import os
+import sys
+import numpy as np
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# data types of the columns that aren't floats, found from the end of the column name
+integerColumns = {'_pid': np.int16, '_charge': np.int8}
+
+
+def columnType(name, values):
+    '''
+        data type a column is stored as, integers for the particle IDs and charges and the type of the values for
+        everything else
+    '''
+
+    for ending, dtype in integerColumns.items():
+        if name.endswith(ending):
+            return dtype
+
+    return np.asarray(values).dtype
+
+
+def storeName(fileName):
+    '''
+        name of the file that actually gets written, a .parquet file turns into a .npz file without pyarrow
+    '''
+
+    base, extension = os.path.splitext(fileName)
+    if extension == '.parquet' and pyarrow is None:
+        return base + '.npz'
+
+    return fileName
+
+
+def saveColumns(fileName, columns, compression='zstd'):
+    '''
+        saves columns of the same length to a compressed columnar file
+        input:
+            fileName (string): name of the file, .parquet or .npz
+            columns (dictionary or DataFrame): column name to 1-d array of values
+            compression (string): Parquet compression codec, .npz files always use zip compression
+        returns:
+            name of the file that was written
+    '''
+
+    fileName = storeName(fileName)
+    data = {name: np.ascontiguousarray(columns[name], dtype=columnType(name, columns[name])) for name in columns}
+
+    if fileName.endswith('.parquet'):
+        table = pyarrow.table(data)
+        pyarrow.parquet.write_table(table, fileName, compression=compression)
+    else:
+        np.savez_compressed(fileName, **data)
+
+    return fileName
+
+
+def listColumns(fileName):
+    '''
+        names of the columns stored in a file, without reading any of them
+    '''
+
+    fileName = storeName(fileName)
+
+    if fileName.endswith('.parquet'):
+        return list(pyarrow.parquet.read_schema(fileName).names)
+
+    with np.load(fileName) as inf:
+        return list(inf.files)
+
+
+def loadColumns(fileName, columns=None):
+    '''
+        loads columns from a file written by saveColumns, only the requested columns are read and decompressed
+        input:
+            fileName (string): name of the file, .parquet or .npz
+            columns (list of strings): names of the columns to load, loads all of them if None
+        returns:
+            dictionary of column name to 1-d array
+    '''
+
+    fileName = storeName(fileName)
+
+    if fileName.endswith('.parquet'):
+        table = pyarrow.parquet.read_table(fileName, columns=columns)
+        return {name: table.column(name).to_numpy() for name in table.column_names}
+
+    # every column is its own member of the zip file, so the columns that aren't asked for are never decompressed
+    with np.load(fileName) as inf:
+        if columns is None:
+            columns = inf.files
+        return {name: inf[name] for name in columns}
+
+
+# main code block
+if __name__ == '__main__':
+    inputName = sys.argv[1] if len(sys.argv) > 1 else 'n3pi_results.parquet'
+    names = sys.argv[2:] if len(sys.argv) > 2 else None
+
+    data = loadColumns(inputName, names)
+    print('Loaded %d columns from %s' % (len(data), storeName(inputName)))
+    for name, values in data.items():
+        print('%-20s %-8s %10d values, mean %g' % (name, values.dtype, len(values), np.mean(values)))
@@ -0,0 +1,118 @@
+#! /usr/bin/env python3
+
+'''
+cutFlow.py is a python module for selecting events with a list of cuts. every cut is evaluated once per chunk of
+events as a vectorized boolean mask and kept, so the masks can be combined with bitwise operations instead of
+making filtered copies of the data. the number of events passing each cut (by itself and after all the cuts
+before it) and the time spent on each cut are counted up over every chunk and printed as a table
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import time
+import numpy as np
+
+
+class CutFlow:
+    '''
+        ordered list of named cuts, the order they are added is the order of the cut flow
+    '''
+
+    def __init__(self):
+        self.cuts = {}          # cut name to function that takes the event values and returns a boolean mask
+        self.masks = {}         # cut name to the mask from the last chunk of events
+
+        # counted up over every chunk of events
+        self.numEvents = 0
+        self.passedAlone = {}   # cut name to number of events that pass the cut by itself
+        self.passedFlow = {}    # cut name to number of events that pass the cut and every cut before it
+        self.seconds = {}       # cut name to time spent evaluating the cut
+
+    def addCut(self, name, func):
+        '''
+            adds a cut to the end of the cut flow
+            input:
+                name (string): name of the cut
+                func (function): takes the event values (ie a dictionary of column name to array) and returns a
+                                 boolean array that is True for the events that pass
+        '''
+
+        self.cuts[name] = func
+        self.passedAlone[name] = 0
+        self.passedFlow[name] = 0
+        self.seconds[name] = 0.
+
+    def addWindow(self, name, column, low, high):
+        '''
+            adds a cut that keeps the events with low <= column <= high, ie a mass window
+        '''
+
+        self.addCut(name, lambda values: (values[column] >= low) & (values[column] <= high))
+
+    def apply(self, values):
+        '''
+            evaluates every cut on a chunk of events and keeps the masks
+            input:
+                values (dictionary or DataFrame): column name to array of values for the chunk of events
+            returns:
+                boolean array that is True for the events that pass every cut
+        '''
+
+        passed = None
+
+        for name, func in self.cuts.items():
+            start = time.perf_counter()
+            mask = np.asarray(func(values), dtype=bool)
+            self.seconds[name] += time.perf_counter() - start
+
+            self.masks[name] = mask
+            passed = mask.copy() if passed is None else np.logical_and(passed, mask, out=passed)
+
+            self.passedAlone[name] += np.count_nonzero(mask)
+            self.passedFlow[name] += np.count_nonzero(passed)
+
+        self.numEvents += len(passed) if passed is not None else 0
+
+        return passed
+
+    def combined(self, names=None, veto=()):
+        '''
+            combines the masks of the last chunk of events without evaluating any cut again
+            input:
+                names (list of strings): cuts the events have to pass, every cut if None
+                veto (list of strings): cuts the events have to fail, ie for a sideband
+            returns:
+                boolean array that is True for the events that pass
+        '''
+
+        if names is None:
+            names = list(self.cuts)
+
+        result = None
+        for name in names:
+            result = self.masks[name].copy() if result is None else np.logical_and(result, self.masks[name],
+                                                                                      out=result)
+        for name in veto:
+            result = ~self.masks[name] if result is None else np.logical_and(result, ~self.masks[name], out=result)
+
+        return result
+
+    def printTable(self):
+        '''
+            prints the number of events passing each cut, the efficiency of the cut by itself, the efficiency
+            relative to the cut before it, and the time spent on the cut
+        '''
+
+        print('%-20s %12s %10s %12s %10s %10s' % ('Cut', 'Alone', 'Eff.', 'Cumulative', 'Rel. Eff.', 'Time (ms)'))
+        print('%-20s %12d %10s %12d %10s %10s' % ('all events', self.numEvents, '', self.numEvents, '', ''))
+
+        before = self.numEvents     # events passing every cut before this one
+        for name in self.cuts:
+            print('%-20s %12d %10.4f %12d %10.4f %10.2f' % (name, self.passedAlone[name],
+                                                           self.passedAlone[name] / max(self.numEvents, 1),
+                                                           self.passedFlow[name],
+                                                           self.passedFlow[name] / max(before, 1),
+                                                           1000. * self.seconds[name]))
+            before = self.passedFlow[name]
@@ -0,0 +1,246 @@
+#! /usr/bin/env python3
+
+'''
+eventCache.py is a python module that converts a genr8 .dat file one time into a binary columnar cache, one .npy
+file per column plus a small header.json with the number of events and a hash of the source file. later runs
+memory-map the columns instead of parsing the text file again, and the cache is rebuilt automatically whenever
+the source file changes. the compact schema stores the momenta as float32 and the particle IDs and charges as int8,
+and columns that are the same for every event (ie the beam photon) are only kept in the header
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import os
+import json
+import hashlib
+import numpy as np
+import genr8Reader
+
+headerName = 'header.json'     # name of the file in the cache directory that describes the cache
+
+# data types of the integer columns in the compact schema, found from the end of the column name
+compactTypes = {'_pid': 'int8', '_charge': 'int8'}
+
+
+def hashFile(fileName):
+    '''
+        finds the sha1 hash of the contents of a file, reading it in large blocks
+        input:
+            fileName (string): name of file to hash
+        returns:
+            hexadecimal string of the hash
+    '''
+
+    sha = hashlib.sha1()
+    with open(fileName, 'rb') as inf:
+        for block in iter(lambda: inf.read(genr8Reader.blockSize), b''):
+            sha.update(block)
+
+    return sha.hexdigest()
+
+
+def defaultCacheDir(fileName, compact=False):
+    '''
+        name of the cache directory that goes with a .dat file, ie n3pi.dat -> n3pi.dat.cache, or
+        n3pi.dat.compact.cache for the compact schema
+    '''
+
+    return fileName + ('.compact.cache' if compact else '.cache')
+
+
+def columnType(name, dtype, compact=False):
+    '''
+        data type a column is stored as, the compact schema keeps the particle IDs and charges as int8
+    '''
+
+    if compact:
+        for ending, compactType in compactTypes.items():
+            if name.endswith(ending):
+                return compactType
+
+    return dtype
+
+
+def readHeader(cacheDir):
+    '''
+        reads the header of a cache
+        input:
+            cacheDir (string): directory of the cache
+        returns:
+            dictionary stored in the header, or None if there is no header
+    '''
+
+    headerFile = os.path.join(cacheDir, headerName)
+    if not os.path.exists(headerFile):
+        return None
+
+    with open(headerFile) as inf:
+        return json.load(inf)
+
+
+def writeHeader(cacheDir, header):
+    '''
+        writes the header of a cache
+        input:
+            cacheDir (string): directory of the cache
+            header (dictionary): information about the cache
+    '''
+
+    with open(os.path.join(cacheDir, headerName), 'w') as outf:
+        json.dump(header, outf, indent=1)
+
+
+def isCacheValid(fileName, cacheDir, dtype, compact=False):
+    '''
+        checks if a cache was made from the current version of the source file. the size and modification time are
+        checked first, the contents are only hashed again if the modification time changed
+        input:
+            fileName (string): name of the source genr8 .dat file
+            cacheDir (string): directory of the cache
+            dtype (string): data type the columns should be stored as, ie 'float64'
+            compact (bool): whether the cache should use the compact schema
+        returns:
+            True if the cache can be used, False if it has to be rebuilt
+    '''
+
+    header = readHeader(cacheDir)
+    if header is None or header['dtype'] != dtype or header.get('compact', False) != compact:
+        return False
+
+    info = os.stat(fileName)
+    if info.st_size != header['sourceSize']:
+        return False
+    if info.st_mtime == header['sourceMtime']:
+        return True
+
+    # the file was touched, only rebuild if the contents are actually different
+    if hashFile(fileName) != header['sourceHash']:
+        return False
+
+    header['sourceMtime'] = info.st_mtime
+    writeHeader(cacheDir, header)
+
+    return True
+
+
+def buildCache(fileName, cacheDir, dtype='float64', chunkSize=100000, compact=False):
+    '''
+        converts a genr8 .dat file to one .npy file per column, streaming the events in chunks so the whole
+        file is never in memory
+        input:
+            fileName (string): name of the source genr8 .dat file
+            cacheDir (string): directory to write the cache to
+            dtype (string): data type to store the columns as, ie 'float64' or 'float32'
+            chunkSize (int): number of events parsed at a time
+            compact (bool): stores the particle IDs and charges as int8 and drops the columns that are the same for
+                            every event, their value is kept in the header instead
+        returns:
+            header of the new cache
+    '''
+
+    os.makedirs(cacheDir, exist_ok=True)
+
+    # remove the old header first, so a cache that is only half written is never used
+    headerFile = os.path.join(cacheDir, headerName)
+    if os.path.exists(headerFile):
+        os.remove(headerFile)
+
+    info = os.stat(fileName)
+    numParticles = genr8Reader.countParticles(fileName)
+
+    # the events can have different numbers and kinds of particles, so the file is read once first to count the
+    # events and find every kind of particle (in the order they first show up, the same as RaggedEvents.kinds of
+    # the whole file), then a second time to fill the columns
+    numEvents = 0
+    kinds = []
+    for events in genr8Reader.iterateRagged(fileName, chunkSize):
+        numEvents += len(events)
+        kinds += [kind for kind in events.kinds() if kind not in kinds]
+
+    columns = {}    # memory-mapped .npy files for every column
+    constant = {}   # column name to whether every value so far is the same as the first one
+    for name in genr8Reader.kindColumns(kinds):
+        columns[name] = np.lib.format.open_memmap(os.path.join(cacheDir, name + '.npy'), mode='w+',
+                                                  dtype=columnType(name, dtype, compact), shape=(numEvents,))
+        constant[name] = compact
+
+    counter = 0     # number of events written so far
+    for events in genr8Reader.iterateRagged(fileName, chunkSize):
+        for name, values in events.columns(kinds).items():
+            stored = columns[name][counter:counter + len(events)]
+            stored[:] = values
+            if constant[name]:
+                constant[name] = bool(np.all(stored == columns[name][0]))
+        counter += len(events)
+
+    # a column that is the same for every event only keeps its value (as it was stored) in the header
+    names = list(columns)
+    constants = {}
+    for name in names:
+        if constant[name] and counter > 0:
+            constants[name] = columns[name][0].item()
+            del columns[name]
+            os.remove(os.path.join(cacheDir, name + '.npy'))
+        else:
+            columns[name].flush()
+
+    header = {'source': os.path.basename(fileName),
+              'sourceSize': info.st_size,
+              'sourceMtime': info.st_mtime,
+              'sourceHash': hashFile(fileName),
+              'numEvents': counter,
+              'numParticles': numParticles,
+              'dtype': dtype,
+              'compact': compact,
+              'columns': names,
+              'constants': constants,
+              'types': {name: columnType(name, dtype, compact) for name in names}}
+    writeHeader(cacheDir, header)
+
+    return header
+
+
+def loadEvents(fileName, cacheDir=None, dtype=None, columns=None, verbose=True, compact=False):
+    '''
+        loads the events in a genr8 .dat file from its cache, building the cache first if it is missing or stale
+        input:
+            fileName (string): name of the source genr8 .dat file
+            cacheDir (string): directory of the cache, next to the source file if None
+            dtype (string): data type the columns are stored as, 'float64' if None ('float32' if compact)
+            columns (list of strings): names of the columns to load, loads all of them if None
+            verbose (bool): prints whether the cache was used or rebuilt if True
+            compact (bool): uses the compact schema (see buildCache)
+        returns:
+            dictionary of column name to read-only memory-mapped 1-d array. a column that is the same for every
+            event is a read-only broadcast of its value, so it takes no memory
+    '''
+
+    if dtype is None:
+        dtype = 'float32' if compact else 'float64'
+    if cacheDir is None:
+        cacheDir = defaultCacheDir(fileName, compact)
+
+    if isCacheValid(fileName, cacheDir, dtype, compact):
+        header = readHeader(cacheDir)
+        if verbose:
+            print('Using cache %s (%d events)' % (cacheDir, header['numEvents']))
+    else:
+        if verbose:
+            print('Building cache %s from %s ...' % (cacheDir, fileName))
+        header = buildCache(fileName, cacheDir, dtype, compact=compact)
+
+    constants = header.get('constants', {})
+    if columns is None:
+        columns = header['columns']
+
+    data = {}
+    for name in columns:
+        if name in constants:
+            data[name] = np.broadcast_to(np.array(constants[name], dtype=header['types'][name]),
+                                         (header['numEvents'],))
+        else:
+            data[name] = np.load(os.path.join(cacheDir, name + '.npy'), mmap_mode='r')
+
+    return data
@@ -0,0 +1,215 @@
+#! /usr/bin/env python3
+
+'''
+fourVector.py is a python module that stores the four-momenta of every particle in every event in one numpy array
+with shape (events, particles, 4), where the last index is px py pz E. the invariant mass of any list of
+combinations of particles is found in one vectorized pass over the array, without making temporary columns for
+the summed momentum components
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import itertools
+import numpy as np
+
+components = ['px', 'py', 'pz', 'e']     # order of the components in the last index of a four-vector array
+
+eventBlock = 4096                        # number of events summed at a time when enumerating combinations
+
+
+def invariantMassSquared(p4):
+    '''
+        calculates the invariant mass squared of four-vectors
+        input:
+            p4 (array of floats): four-vectors, the last index is px py pz E
+        returns:
+            array of invariant masses squared, one for each four-vector
+    '''
+
+    return p4[..., 3]**2 - p4[..., 0]**2 - p4[..., 1]**2 - p4[..., 2]**2
+
+
+def invariantMass(p4):
+    '''
+        calculates the invariant mass of four-vectors
+        input:
+            p4 (array of floats): four-vectors, the last index is px py pz E
+        returns:
+            array of invariant masses, one for each four-vector
+    '''
+
+    return np.sqrt(invariantMassSquared(p4))
+
+
+class FourVectorArray:
+    '''
+        four-momenta of a list of named particles for many events
+        p4 (3-d array of floats): four-vectors with shape (events, particles, 4)
+        labels (list of strings): names of the particles, in the order of the second index of p4
+    '''
+
+    def __init__(self, p4, labels):
+        self.p4 = np.asarray(p4)
+        self.labels = list(labels)
+
+    @classmethod
+    def fromColumns(cls, columns, labels, dtype=np.float64):
+        '''
+            builds the array from named columns, ie pip1_px (see genr8Reader.eventColumns)
+            input:
+                columns (dictionary): column name to 1-d array of values
+                labels (list of strings): names of the particles to include
+                dtype (numpy data type): data type of the four-vectors
+            returns:
+                FourVectorArray of the particles
+        '''
+
+        numEvents = len(columns[labels[0] + '_e'])
+        p4 = np.empty((numEvents, len(labels), 4), dtype=dtype)
+
+        for i in range(len(labels)):
+            for j in range(4):
+                p4[:, i, j] = columns[labels[i] + '_' + components[j]]
+
+        return cls(p4, labels)
+
+    def __len__(self):
+        return self.p4.shape[0]
+
+    def __getitem__(self, label):
+        '''
+            four-vectors of one particle, with shape (events, 4)
+        '''
+
+        return self.p4[:, self.labels.index(label)]
+
+    def addParticle(self, label, p4):
+        '''
+            adds a particle to every event
+            input:
+                label (string): name of the particle
+                p4 (array of floats): four-vectors with shape (events, 4), or one four-vector used for every event
+        '''
+
+        p4 = np.broadcast_to(np.asarray(p4, dtype=self.p4.dtype), (len(self), 4))
+        self.p4 = np.concatenate([self.p4, p4[:, np.newaxis, :]], axis=1)
+        self.labels.append(label)
+
+    def coefficients(self, subsets):
+        '''
+            turns lists of particle names into a matrix of coefficients, a particle name that starts with a minus
+            sign is subtracted instead of added (ie for a missing four-momentum)
+            input:
+                subsets (list of lists of strings): particles to add up for each combination
+            returns:
+                2-d array with shape (combinations, particles)
+        '''
+
+        matrix = np.zeros((len(subsets), len(self.labels)), dtype=self.p4.dtype)
+
+        for i in range(len(subsets)):
+            for label in subsets[i]:
+                if label.startswith('-'):
+                    matrix[i, self.labels.index(label[1:])] -= 1.0
+                else:
+                    matrix[i, self.labels.index(label)] += 1.0
+
+        return matrix
+
+    def combine(self, subsets):
+        '''
+            adds up the four-vectors of every combination of particles
+            input:
+                subsets (list of lists of strings): particles to add up for each combination
+            returns:
+                3-d array of summed four-vectors with shape (events, combinations, 4)
+        '''
+
+        # (events, 4, particles) times (particles, combinations) sums every combination in one matrix product
+        total = np.matmul(self.p4.transpose(0, 2, 1), self.coefficients(subsets).T)
+
+        return total.transpose(0, 2, 1)
+
+    def invariantMasses(self, subsets):
+        '''
+            calculates the invariant mass of every combination of particles
+            input:
+                subsets (list of lists of strings): particles to add up for each combination
+            returns:
+                2-d array of invariant masses with shape (events, combinations)
+        '''
+
+        return invariantMass(self.combine(subsets))
+
+    def invariantMassesSquared(self, subsets):
+        '''
+            calculates the invariant mass squared of every combination of particles (ie for Dalitz plots)
+            input:
+                subsets (list of lists of strings): particles to add up for each combination
+            returns:
+                2-d array of invariant masses squared with shape (events, combinations)
+        '''
+
+        return invariantMassSquared(self.combine(subsets))
+
+    def subsetMasses(self, sizes, labels=None):
+        '''
+            calculates the invariant mass of every combination of k particles for each k in sizes. the four-vector
+            sums of the k-particle combinations are built by adding one particle to the (k-1)-particle sums, so
+            every partial sum is only calculated once
+            input:
+                sizes (list of ints): numbers of particles in the combinations, ie [2, 3, 4]
+                labels (list of strings): particles to combine, uses every particle if None
+            returns:
+                list of tuples of particle names for each combination and a 2-d array of invariant masses with
+                shape (events, combinations), the combinations go in increasing order of size
+        '''
+
+        if labels is None:
+            labels = self.labels
+
+        # the masses are filled level by level in increasing k, so the names have to be in that order too
+        sizes = sorted(set(sizes))
+
+        particles = [self.labels.index(label) for label in labels]
+
+        # work out which (k-1)-particle combination and which extra particle every k-particle combination is
+        # built from, level by level
+        levels = [[(i,) for i in range(len(particles))]]
+        parents = [None]
+        lasts = [None]
+        for k in range(2, max(sizes) + 1):
+            position = {levels[-1][i]: i for i in range(len(levels[-1]))}
+            levels.append(list(itertools.combinations(range(len(particles)), k)))
+            parents.append([position[subset[:-1]] for subset in levels[-1]])
+            lasts.append([subset[-1] for subset in levels[-1]])
+
+        # names of the particles in each combination, in the order of the columns of masses
+        subsets = []
+        for k in sizes:
+            subsets += [tuple(labels[i] for i in subset) for subset in levels[k - 1]]
+
+        masses = np.empty((len(subsets), len(self)), dtype=self.p4.dtype)
+
+        # the events are done in blocks small enough for all the partial sums of a block to stay in the cache.
+        # the sums are kept with shape (combinations, 4, events) so picking out the sums of whole combinations
+        # copies contiguous pieces of memory
+        for start in range(0, len(self), eventBlock):
+            stop = min(start + eventBlock, len(self))
+            single = np.ascontiguousarray(self.p4[start:stop, particles, :].transpose(1, 2, 0))
+
+            sums = single
+            column = 0
+            for k in range(1, max(sizes) + 1):
+                # every combination of k particles is a combination of k-1 particles with one more particle
+                # added to the end, so the sums of this level come from the sums of the last level
+                if k > 1:
+                    sums = sums[parents[k - 1]] + single[lasts[k - 1]]
+
+                if k in sizes:
+                    masses[column:column + len(sums), start:stop] = invariantMass(sums.transpose(0, 2, 1))
+                    column += len(sums)
+
+        return subsets, masses.T
@@ -11,9 +11,11 @@ PHZ 4151C
 Feb 26, 2021
 '''
 
+from functools import partial
 import numpy as np
 import matplotlib.pyplot as plt
 import integration
+import monteCarlo
 
 def f(x, a):
 
@@ -99,6 +101,46 @@ def gamma(a):
 
     return I
 
+def f_points(points, dim, a):
+
+    '''
+       f_z evaluated at a (points, 1) array of sample points, the form of integrand monteCarlo.integrate takes
+
+       input:
+           points (2-d array of floats): values of z with shape (points, 1)
+           dim (int): number of dimensions, 1
+           a (float): dependent variable for function
+
+        returns:
+            array with the value of the function at every point
+    '''
+
+    # f_z is 0 at z = 0, where the log in the exponent is -infinity
+    with np.errstate(divide='ignore'):
+        return f_z(points[:, 0], a)
+
+def gammaQMC(a, N=1 << 16, method='sobol'):
+
+    '''
+       defines the gamma function, performs integral using randomized quasi-Monte Carlo (scrambled Sobol or Halton
+       points, see monteCarlo.py), which converges close to 1/N for a smooth integrand like this one
+
+       input:
+           a (float): dependent variable for function
+           N (int): number of sample points
+           method (string): 'sobol' or 'halton'
+
+        returns:
+            approximate value for integral and its error, from the spread of independently scrambled sequences
+    '''
+
+    lower = 0.0
+    upper = 0.9999      # same limits as gamma
+
+    I, sigma, stats = monteCarlo.integrate(partial(f_points, a=a), 1, [[lower, upper]], N, method=method)
+
+    return I, sigma
+
 # main code block
 x = np.linspace(0,5,100)  # range of x values from 0 to 5 for plotting
 
@@ -133,3 +175,8 @@ print(f'Gamma when a=3/2 is {gamma(1.5):.3f}')
 print(f'Gamma when a=3 is {gamma(3.0):.5f}')
 print(f'Gamma when a=6 is {gamma(6.0):.5f}')
 print(f'Gamma when a=10 is {gamma(10.0):.5f}')
+
+# the same values from quasi-Monte Carlo
+for a in [1.5, 3.0, 6.0, 10.0]:
+    I, sigma = gammaQMC(a)
+    print(f'Gamma when a={a} from quasi-Monte Carlo is {I:.5f} +- {sigma:.1e}')
@@ -0,0 +1,318 @@
+#! /usr/bin/env python3
+
+'''
+genr8Generator.py is a python module (and script) that generates events evenly distributed in phase space and
+writes them in the genr8 .dat format, so reproducible input files of any size can be made for testing and timing
+the analysis. the events are generated a chunk at a time with the Raubold-Lynch method (as in GENBOD), which is
+vectorized over the events, and the text of the file is built directly as bytes with numpy instead of formatting
+every number in python. the same seed always gives the same file
+
+usage:
+    python genr8Generator.py output.dat number_of_events [-s seed] [-r reaction] [-E beam_energy]
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import sys
+import time
+import numpy as np
+import genr8Reader
+import lorentzBoost
+
+# geant particle ID, charge and mass in GeV of the particles that can be generated
+particleIDs = {name: pid for pid, name in genr8Reader.particleNames.items()}
+particleCharges = {'photon': 0, 'positron': 1, 'electron': -1, 'pi0': 0, 'pip': 1, 'pim': -1, 'kp': 1, 'km': -1,
+                   'neutron': 0, 'proton': 1}
+particleMasses = {'photon': 0.0, 'positron': 0.000511, 'electron': 0.000511, 'pi0': 0.134977, 'pip': 0.13957,
+                  'pim': 0.13957, 'kp': 0.493677, 'km': 0.493677, 'neutron': 0.93957, 'proton': 0.938272}
+
+# reactions of a photon beam on a proton target at rest. the products are generated in this order, and the ones
+# that are missing aren't written to the file (ie the recoil neutron of g p -> n pi+ pi- pi+)
+reactions = {'n3pi': {'beamEnergy': 5.0, 'products': ['neutron', 'pip', 'pim', 'pip'], 'missing': ['neutron']},
+             'p2pi': {'beamEnergy': 5.0, 'products': ['proton', 'pip', 'pim'], 'missing': ['proton']},
+             'pkk': {'beamEnergy': 5.0, 'products': ['proton', 'kp', 'km'], 'missing': ['proton']}}
+
+
+def twoBodyMomentum(mass, mass1, mass2):
+    '''
+        momentum of the daughters of a two body decay in the rest frame of the parent, zero below threshold
+    '''
+
+    value = (mass**2 - (mass1 + mass2)**2) * (mass**2 - (mass1 - mass2)**2)
+
+    return np.sqrt(np.maximum(value, 0.0)) / (2.0 * mass)
+
+
+def randomDirections(rng, size):
+    '''
+        isotropic unit vectors with shape (size, 3)
+    '''
+
+    cosTheta = rng.uniform(-1.0, 1.0, size)
+    phi = rng.uniform(0.0, 2.0 * np.pi, size)
+    sinTheta = np.sqrt(1.0 - cosTheta**2)
+
+    return np.stack([sinTheta * np.cos(phi), sinTheta * np.sin(phi), cosTheta], axis=1)
+
+
+def phaseSpace(rng, numEvents, energy, masses):
+    '''
+        generates events evenly distributed in n body phase space in their center of mass frame, the events are
+        weighted with the Raubold-Lynch method and then accepted with a probability proportional to their weight
+        input:
+            rng (numpy Generator): random number generator
+            numEvents (int): number of events to generate
+            energy (float): center of mass energy in GeV
+            masses (list of floats): masses of the products
+        returns:
+            3-d array of four-vectors with shape (events, products, 4), with px py pz E
+    '''
+
+    masses = np.asarray(masses, dtype=np.float64)
+    numProducts = len(masses)
+    kinetic = energy - np.sum(masses)
+    if kinetic <= 0:
+        raise ValueError('the center of mass energy %g GeV is below threshold' % energy)
+
+    def weighted(batch):
+        # invariant masses of the first k products, M_0 = m_0 < M_1 < ... < M_(n-1) = energy, and the weights
+        fractions = np.zeros((batch, numProducts))
+        fractions[:, 1:-1] = np.sort(rng.random((batch, numProducts - 2)), axis=1)
+        fractions[:, -1] = 1.0
+        subMasses = np.cumsum(masses) + fractions * kinetic
+        momenta = twoBodyMomentum(subMasses[:, 1:], subMasses[:, :-1], masses[1:])
+        return subMasses, momenta, np.prod(momenta, axis=1)
+
+    # every two body momentum at its largest value bounds the weight, but far too loosely for 4 or more products
+    # (only about 5% of the events would be kept), so the bound is taken from a first sample of weights with some
+    # room to spare, and raised if a larger weight ever shows up
+    largest = 1.0
+    for k in range(1, numProducts):
+        largest *= twoBodyMomentum(kinetic + np.sum(masses[:k + 1]), np.sum(masses[:k]), masses[k])
+    largest = min(largest, 1.1 * np.max(weighted(100000)[2]))
+    efficiency = 0.5
+
+    accepted = []
+    numAccepted = 0
+    while numAccepted < numEvents:
+        batch = max(int(1.1 * (numEvents - numAccepted) / efficiency), 1000)
+        subMasses, momenta, weights = weighted(batch)
+        largest = max(largest, np.max(weights))
+
+        keep = weights > rng.random(batch) * largest
+        efficiency = max(np.count_nonzero(keep) / batch, 0.01)
+
+        accepted.append((subMasses[keep], momenta[keep]))
+        numAccepted += np.count_nonzero(keep)
+
+    subMasses = np.concatenate([item[0] for item in accepted])[:numEvents]
+    momenta = np.concatenate([item[1] for item in accepted])[:numEvents]
+
+    # the first two products back to back in the rest frame of M_1, then every next product is added back to back
+    # with the products before it in the rest frame of M_k, and the products before it are boosted into that frame
+    p4 = np.empty((numEvents, numProducts, 4))
+    buffers = lorentzBoost.BoostBuffers(numEvents)
+    velocity = np.empty((numEvents, 3))
+
+    for k in range(1, numProducts):
+        direction = randomDirections(rng, numEvents)
+        p = momenta[:, k - 1, np.newaxis] * direction
+
+        if k > 1:
+            # the products so far move with -p, boosting by the opposite of that velocity goes into the M_k frame
+            np.multiply(p, 1.0 / np.sqrt(momenta[:, k - 1]**2 + subMasses[:, k - 1]**2)[:, np.newaxis], out=velocity)
+            for i in range(k):
+                lorentzBoost.boost(p4[:, i], velocity, p4[:, i], buffers)
+        else:
+            p4[:, 0, :3] = -p
+            p4[:, 0, 3] = np.sqrt(momenta[:, 0]**2 + masses[0]**2)
+
+        p4[:, k, :3] = p
+        p4[:, k, 3] = np.sqrt(momenta[:, k - 1]**2 + masses[k]**2)
+
+    return p4
+
+
+def generateEvents(rng, numEvents, reaction, beamEnergy=None, targetMass=particleMasses['proton']):
+    '''
+        generates events of a reaction of a photon beam on a target at rest, in the lab frame
+        input:
+            rng (numpy Generator): random number generator
+            numEvents (int): number of events to generate
+            reaction (dictionary): products, missing products and beam energy, ie reactions['n3pi']
+            beamEnergy (float): energy of the beam in GeV, the energy of the reaction if None
+            targetMass (float): mass of the target in GeV
+        returns:
+            3-d array with shape (events, particles, 6) following genr8Reader.particleFields, with the beam first
+            and then the products that aren't missing
+    '''
+
+    if beamEnergy is None:
+        beamEnergy = reaction['beamEnergy']
+    products = reaction['products']
+    written = [i for i, name in enumerate(products) if name not in reaction.get('missing', [])]
+
+    energy = np.sqrt(targetMass**2 + 2.0 * beamEnergy * targetMass)
+    p4 = phaseSpace(rng, numEvents, energy, [particleMasses[name] for name in products])
+
+    # boost from the center of mass frame to the lab, which moves along -z as seen from the center of mass
+    buffers = lorentzBoost.BoostBuffers(numEvents)
+    velocity = np.zeros((numEvents, 3))
+    velocity[:, 2] = -beamEnergy / (beamEnergy + targetMass)
+    for i in written:
+        lorentzBoost.boost(p4[:, i], velocity, p4[:, i], buffers)
+
+    events = np.empty((numEvents, 1 + len(written), 6))
+    events[:, 0] = [particleIDs['photon'], 0, 0.0, 0.0, beamEnergy, beamEnergy]
+    for j, i in enumerate(written):
+        events[:, j + 1, 0] = particleIDs[products[i]]
+        events[:, j + 1, 1] = particleCharges[products[i]]
+        events[:, j + 1, 2:] = p4[:, i]
+
+    return events
+
+
+def packWords(strings):
+    '''
+        packs strings of up to 4 characters into one 32 bit word each, right aligned with zeros in front
+    '''
+
+    return np.frombuffer(b''.join(text.encode().rjust(4, b'\0') for text in strings), dtype=np.uint32)
+
+
+# the text of a file is built out of 4 character words that are looked up in these tables, so writing a number is
+# a few lookups instead of working out every digit. the zeros used as padding are removed at the end
+integerWords = packWords(['%d' % value for value in range(-999, 10000)])        # index is value + 999
+spacedIntegerWords = packWords([' %d' % value for value in range(-99, 1000)])    # index is value + 99
+signWords = packWords([' ', ' -'])                                               # index is 1 for a negative value
+headWords = packWords(['%d.%02d' % divmod(value, 100) for value in range(1000)])  # first 3 digits, ie 1.23
+digitWords = packWords(['%04d' % value for value in range(10000)])               # last 4 digits
+exponentWords = packWords(['e%+03d' % value for value in range(-99, 100)])       # index is exponent + 99
+newlineWord = packWords(['\n'])[0]
+
+
+def formatIntegers(values, spaced=False):
+    '''
+        writes integers as text
+        input:
+            values (1-d array of ints): values to write, from -999 to 9999 (or -99 to 999 if spaced)
+            spaced (bool): puts a space in front of each value
+        returns:
+            1-d array of one 4 character word (uint32) per value
+    '''
+
+    values = np.asarray(values, dtype=np.int64)
+    if spaced:
+        return spacedIntegerWords[values + 99]
+
+    return integerWords[values + 999]
+
+
+def formatFloats(values):
+    '''
+        writes floats as text in the %e format with 6 digits after the decimal point and a space in front, ie
+        " -1.984560e-01"
+        input:
+            values (1-d array of floats): values to write, smaller than 1e100
+        returns:
+            2-d array of 4 character words (uint32) with shape (values, 4)
+    '''
+
+    magnitude = np.abs(values)
+    exponent = np.floor(np.log10(np.where(magnitude > 0, magnitude, 1.0))).astype(np.int64)
+    mantissa = np.rint(magnitude / 10.0**exponent * 1e6).astype(np.int64)
+
+    # rounding can carry into another digit, ie 9.9999999 -> 10.000000e+00 -> 1.000000e+01
+    carry = mantissa >= 10000000
+    mantissa[carry] //= 10
+    exponent[carry] += 1
+    mantissa[magnitude == 0] = 0
+    exponent[magnitude == 0] = 0
+
+    high, low = np.divmod(mantissa, 10000)
+    words = np.empty((len(values), 4), dtype=np.uint32)
+    words[:, 0] = signWords[(values < 0).view(np.uint8)]
+    words[:, 1] = headWords[high]
+    words[:, 2] = digitWords[low]
+    words[:, 3] = exponentWords[exponent + 99]
+
+    return words
+
+
+def formatEvents(events):
+    '''
+        writes events as the text of a genr8 .dat file
+        input:
+            events (3-d array of floats): events with shape (events, particles, 6) following
+                                          genr8Reader.particleFields
+        returns:
+            bytes of the text
+    '''
+
+    numEvents, numParticles = events.shape[0], events.shape[1]
+
+    # an event is one word for the number of particles, then one line of 19 words for each particle: ID, charge,
+    # 4 words for each of px py pz E and a newline
+    words = np.empty((numEvents, 1 + 19 * numParticles), dtype=np.uint32)
+    words[:, 0] = packWords(['%d\n' % numParticles])[0]
+
+    lines = words[:, 1:].reshape(numEvents, numParticles, 19)
+    lines[..., 0] = formatIntegers(events[..., 0].astype(np.int64))
+    lines[..., 1] = formatIntegers(events[..., 1].astype(np.int64), spaced=True)
+    lines[..., 2:18] = formatFloats(events[..., 2:].ravel()).reshape(numEvents, numParticles, 16)
+    lines[..., 18] = newlineWord
+
+    text = words.view(np.uint8)
+
+    return text[text != 0].tobytes()
+
+
+def writeGenr8(fileName, numEvents, reaction='n3pi', seed=None, beamEnergy=None, chunkSize=500000, verbose=True):
+    '''
+        generates events and writes them to a genr8 .dat file a chunk at a time
+        input:
+            fileName (string): name of the .dat file to write
+            numEvents (int): number of events
+            reaction (string or dictionary): name of a reaction in reactions, or the reaction itself
+            seed (int): seed of the random numbers, the same seed and chunkSize always give the same file
+            beamEnergy (float): energy of the beam in GeV, the energy of the reaction if None
+            chunkSize (int): number of events generated at a time
+            verbose (bool): prints the number of events written and how fast if True
+        returns:
+            number of events written
+    '''
+
+    if isinstance(reaction, str):
+        reaction = reactions[reaction]
+    rng = np.random.default_rng(seed)
+
+    start = time.perf_counter()
+    with open(fileName, 'wb') as outf:
+        for first in range(0, numEvents, chunkSize):
+            events = generateEvents(rng, min(chunkSize, numEvents - first), reaction, beamEnergy)
+            outf.write(formatEvents(events))
+    elapsed = time.perf_counter() - start
+
+    if verbose:
+        print('Wrote %d events to %s in %.2f s (%.0f events/s)' % (numEvents, fileName, elapsed,
+                                                                   numEvents / max(elapsed, 1e-9)))
+
+    return numEvents
+
+
+# main code block
+if __name__ == '__main__':
+    outputName = sys.argv[1] if len(sys.argv) > 1 else 'n3pi_generated.dat'
+    numEvents = int(float(sys.argv[2])) if len(sys.argv) > 2 else 100000
+
+    options = {}
+    if '-s' in sys.argv:
+        options['seed'] = int(sys.argv[sys.argv.index('-s') + 1])
+    if '-r' in sys.argv:
+        options['reaction'] = sys.argv[sys.argv.index('-r') + 1]
+    if '-E' in sys.argv:
+        options['beamEnergy'] = float(sys.argv[sys.argv.index('-E') + 1])
+
+    writeGenr8(outputName, numEvents, **options)
@@ -0,0 +1,463 @@
+#! /usr/bin/env python3
+
+'''
+genr8Reader.py is a python module that reads genr8 .dat event files straight into numpy arrays. the file is read
+in large blocks of text which are parsed all at once with numpy instead of splitting every line in python, so there
+is no need to convert the file to a csv and read it back in with pandas. events can be read all at once or
+streamed in chunks of a fixed number of events. the number of particles in each event is taken from the file, so
+the same reader works for any reaction, and events with different numbers of particles are stored as one flat
+array of particles with the offset of each event
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import time
+import warnings
+import numpy as np
+
+## format of one event
+## 4   # number of particles
+## 1 0 0.000000e+00 0.000000e+00 5.000000e+00 5.000000e+00    # ID charge px py pz E
+## 8 1 -2.261780e-01 -1.984560e-01 1.946048e+00 1.974144e+00
+## 9 -1 -7.765000e-02 7.233300e-02 1.372624e+00 1.383820e+00
+## 8 1 5.548030e-01 -3.011580e-01 1.301439e+00 1.453219e+00
+
+# names of the quantities stored for every particle, in the order they appear on a line of the file
+particleFields = ['pid', 'charge', 'px', 'py', 'pz', 'e']
+
+# names used for the columns of the particles, based on their geant particle ID
+particleNames = {1: 'photon', 2: 'positron', 3: 'electron', 7: 'pi0', 8: 'pip', 9: 'pim', 11: 'kp', 12: 'km',
+                 13: 'neutron', 14: 'proton'}
+
+blockSize = 1 << 24     # number of bytes of text read from the file at a time (16 MB)
+
+
+def countParticles(fileName):
+    '''
+        finds the number of particles per event by looking at the first line of the file
+        input:
+            fileName (string): name of genr8 .dat file
+        returns:
+            number of particles in each event
+    '''
+
+    with open(fileName) as inf:
+        first = inf.readline().split()
+
+    if len(first) == 0:
+        raise ValueError('%s does not start with an event' % fileName)
+
+    return int(first[0])
+
+
+def parseBlock(text):
+    '''
+        parses a block of whole events from a genr8 .dat file
+        input:
+            text (bytes): whole events, ending in a newline
+        returns:
+            RaggedEvents of the events in the block
+    '''
+
+    # np.fromstring stops at the first value that isn't a number (with only a warning), so the number of values it
+    # found is checked against the number of values in the text. a value starts wherever a character that isn't
+    # whitespace comes after whitespace (or the start of the block)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        values = np.fromstring(text, sep=' ')
+
+    chars = np.frombuffer(text, dtype=np.uint8)
+    space = (chars == 32) | (chars == 9) | (chars == 10) | (chars == 13)
+    valueStart = ~space
+    valueStart[1:] &= space[:-1]
+
+    if len(values) != np.count_nonzero(valueStart):
+        raise ValueError('found a value that is not a number')
+
+    # most files have the same number of particles in every event, then every event is the same number of values
+    # and the particle counts can be checked without looking at the lines at all
+    if len(values) > 0:
+        numParticles = int(values[0])
+        eventLength = 1 + 6 * numParticles
+        if len(values) % eventLength == 0 and np.all(values[::eventLength] == numParticles):
+            table = values.reshape(-1, eventLength)
+            return RaggedEvents(np.full(len(table), numParticles), table[:, 1:].reshape(-1, 6))
+
+    # otherwise the number of values on every line is counted with numpy, lines with one value give the number of
+    # particles in an event and lines with six values are particles
+
+    # number of values on each line, found from the number of values that start before the end of every line
+    lineEnds = np.flatnonzero(chars == 10)
+    valuesSoFar = np.searchsorted(np.flatnonzero(valueStart), lineEnds)
+    lineValues = np.diff(valuesSoFar, prepend=0)
+    lineValues = lineValues[lineValues > 0]     # skips empty lines
+
+    if np.any((lineValues != 1) & (lineValues != 6)):
+        raise ValueError('found a line that is neither a particle count nor a particle')
+
+    countLine = (lineValues == 1)
+
+    # the particle counts are the values on the one-value lines, the rest of the values belong to particles
+    lineStarts = np.cumsum(lineValues) - lineValues
+    counts = values[lineStarts[countLine]].astype(np.int64)
+    isParticle = np.ones(len(values), dtype=bool)
+    isParticle[lineStarts[countLine]] = False
+    particles = values[isParticle].reshape(-1, 6)
+
+    # the number of particle lines after each count line has to match the count
+    countLines = np.flatnonzero(countLine)
+    found = np.diff(countLines, append=len(lineValues)) - 1
+    if len(countLines) == 0 or countLines[0] != 0 or np.any(found != counts):
+        raise ValueError('found an event whose particle count does not match its number of particles')
+
+    return RaggedEvents(counts, particles)
+
+
+def iterateRagged(fileName, chunkSize=100000):
+    '''
+        reads a genr8 .dat file of any reaction in chunks of whole events, the events can have different numbers of
+        particles
+        input:
+            fileName (string): name of genr8 .dat file
+            chunkSize (int): number of events returned at a time (the last chunk may be smaller)
+        returns:
+            generator of RaggedEvents
+    '''
+
+    leftover = None         # events parsed from the last block of text that didn't fill up a chunk
+
+    with open(fileName, 'rb') as inf:
+        tail = b''          # part of the last block of text after the start of its last event
+
+        while True:
+            text = inf.read(blockSize)
+            endOfFile = (text == b'')
+            text = tail + text
+
+            # only parse whole events, the last event in the block might continue in the next block so it is saved
+            # for later. an event starts at a line with a single value on it, which is found from the last lines
+            if endOfFile:
+                cut = len(text)
+            else:
+                cut = lastEventStart(text)
+            tail = text[cut:]
+
+            if cut > 0:
+                events = parseBlock(text[:cut] if text[:cut].endswith(b'\n') else text[:cut] + b'\n')
+                if leftover is not None:
+                    events = RaggedEvents.concatenate([leftover, events])
+
+                # hand out as many full chunks as possible, keep the rest to be joined with the next block
+                numFull = len(events) // chunkSize
+                for i in range(numFull):
+                    yield events.slice(i * chunkSize, (i + 1) * chunkSize)
+                leftover = events.slice(numFull * chunkSize, len(events))
+
+            if endOfFile:
+                if leftover is not None and len(leftover) > 0:
+                    yield leftover
+                break
+
+
+def lastEventStart(text):
+    '''
+        finds where the last event that starts in a block of text begins
+        input:
+            text (bytes): block of text read from a genr8 .dat file
+        returns:
+            index of the first character of the last line in the block that holds a single value, or 0 if none
+    '''
+
+    end = text.rfind(b'\n') + 1        # a partial line at the end is never a finished count line
+
+    while end > 0:
+        start = text.rfind(b'\n', 0, end - 1) + 1
+        if len(text[start:end].split()) == 1:
+            return start
+        end = start
+
+    return 0
+
+
+def iterateEvents(fileName, chunkSize=100000):
+    '''
+        reads a genr8 .dat file in chunks of whole events, every event must have the same number of particles
+        input:
+            fileName (string): name of genr8 .dat file
+            chunkSize (int): number of events returned at a time (the last chunk may be smaller)
+        returns:
+            generator of 3-d arrays of floats with shape (events, particles, 6). the last index follows particleFields
+    '''
+
+    for events in iterateRagged(fileName, chunkSize):
+        yield events.toArray()
+
+
+class RaggedEvents:
+    '''
+        events with any number of particles, stored as one flat array of particles with the offset of each event
+        counts (1-d array of ints): number of particles in each event
+        particles (2-d array of floats): every particle of every event with shape (particles, 6), the second index
+                                         follows particleFields
+        multIndex (1-d array of ints): multiplicity index of every particle, worked out from the particle IDs if None
+    '''
+
+    def __init__(self, counts, particles, multIndex=None):
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.particles = particles
+
+        # the particles of event i are particles[offsets[i]:offsets[i+1]]
+        self.offsets = np.zeros(len(self.counts) + 1, dtype=np.int64)
+        np.cumsum(self.counts, out=self.offsets[1:])
+
+        # event each particle belongs to, and the multiplicity index of each particle (0 for the first particle of
+        # its kind in the event, 1 for the second, ...)
+        self.eventIndex = np.repeat(np.arange(len(self.counts)), self.counts)
+        if multIndex is None:
+            multIndex = multiplicityIndex(self.eventIndex, self.particles[:, 0])
+        self.multIndex = multIndex
+
+    @classmethod
+    def concatenate(cls, pieces):
+        return cls(np.concatenate([piece.counts for piece in pieces]),
+                   np.concatenate([piece.particles for piece in pieces]),
+                   np.concatenate([piece.multIndex for piece in pieces]))
+
+    def __len__(self):
+        return len(self.counts)
+
+    def slice(self, start, stop):
+        '''
+            events start up to (not including) stop, the particles are a view so no data is copied
+        '''
+
+        first = self.offsets[start]
+        last = self.offsets[stop]
+
+        return RaggedEvents(self.counts[start:stop], self.particles[first:last], self.multIndex[first:last])
+
+    def isRegular(self):
+        '''
+            True if every event has the same number of particles
+        '''
+
+        return len(self) == 0 or np.all(self.counts == self.counts[0])
+
+    def toArray(self):
+        '''
+            reshapes events that all have the same number of particles
+            returns:
+                3-d array of floats with shape (events, particles, 6)
+        '''
+
+        if not self.isRegular():
+            raise ValueError('events do not all have the same number of particles')
+
+        numParticles = self.counts[0] if len(self) > 0 else 0
+        return self.particles.reshape(len(self), numParticles, 6)
+
+    def kinds(self):
+        '''
+            finds every (particle ID, multiplicity index) pair in the events, in the order they first show up
+            returns:
+                list of (pid, multiplicity index) tuples
+        '''
+
+        keys = self.particles[:, 0].astype(np.int64) * (self.multIndex.max(initial=0) + 1) + self.multIndex
+        unique, first = np.unique(keys, return_index=True)
+        order = np.argsort(first)
+
+        return [(int(self.particles[first[i], 0]), int(self.multIndex[first[i]])) for i in order]
+
+    def select(self, pid, mult=0):
+        '''
+            picks out one kind of particle from every event
+            input:
+                pid (int): geant particle ID
+                mult (int): multiplicity index, ie 1 for the second pi+ in an event
+            returns:
+                2-d array of floats with shape (events, 6), filled with nan for events without that particle
+        '''
+
+        rows = np.flatnonzero((self.particles[:, 0] == pid) & (self.multIndex == mult))
+        result = np.full((len(self), 6), np.nan)
+        result[self.eventIndex[rows]] = self.particles[rows]
+
+        return result
+
+    def columns(self, kinds=None):
+        '''
+            splits the events into named columns, ie pip1_px, no matter what order the particles are in
+            input:
+                kinds (list of (pid, multiplicity index) tuples): particles to make columns for, all of them if None
+            returns:
+                dictionary of column name to 1-d array
+        '''
+
+        if kinds is None:
+            kinds = self.kinds()
+
+        columns = {}
+        for name, (pid, mult) in zip(kindLabels(kinds), kinds):
+            values = self.select(pid, mult)
+            for j in range(len(particleFields)):
+                columns[name + '_' + particleFields[j]] = values[:, j]
+
+        return columns
+
+
+def kindLabels(kinds):
+    '''
+        names the kinds of particles found by RaggedEvents.kinds, particles that can show up more than once in an
+        event get numbered starting from 1 (ie pip1, pip2)
+        input:
+            kinds (list of (pid, multiplicity index) tuples): kinds of particles
+        returns:
+            list of names for the kinds
+    '''
+
+    numbered = set(pid for pid, mult in kinds if mult > 0)
+
+    labels = []
+    for pid, mult in kinds:
+        name = particleNames.get(pid, 'particle%d' % pid)
+        if pid in numbered:
+            name += str(mult + 1)
+        labels.append(name)
+
+    return labels
+
+
+def kindColumns(kinds):
+    '''
+        names of the columns RaggedEvents.columns makes for a list of kinds of particles, in the same order
+    '''
+
+    return [name + '_' + field for name in kindLabels(kinds) for field in particleFields]
+
+
+def multiplicityIndex(eventIndex, pids):
+    '''
+        numbers the particles of the same kind within each event in the order they show up, ie the first pi+ of an
+        event gets 0 and the second gets 1
+        input:
+            eventIndex (1-d array of ints): event each particle belongs to
+            pids (1-d array): particle ID of each particle
+        returns:
+            1-d array of ints with the multiplicity index of each particle
+    '''
+
+    # sort the particles by event, then by kind, keeping the order they showed up in
+    order = np.lexsort((pids, eventIndex))
+    sortedEvents = eventIndex[order]
+    sortedPids = pids[order]
+
+    # position in the sorted list where each run of the same kind of particle in the same event starts
+    newGroup = np.ones(len(order), dtype=bool)
+    newGroup[1:] = (sortedEvents[1:] != sortedEvents[:-1]) | (sortedPids[1:] != sortedPids[:-1])
+    groupStart = np.maximum.accumulate(np.where(newGroup, np.arange(len(order)), 0))
+
+    result = np.empty(len(order), dtype=np.int64)
+    result[order] = np.arange(len(order)) - groupStart
+
+    return result
+
+
+def readRagged(fileName, chunkSize=100000, verbose=True):
+    '''
+        reads every event in a genr8 .dat file of any reaction
+        input:
+            fileName (string): name of genr8 .dat file
+            chunkSize (int): number of events parsed at a time
+            verbose (bool): prints the number of events read and the events/second if True
+        returns:
+            RaggedEvents of every event in the file
+    '''
+
+    start = time.perf_counter()
+
+    chunks = list(iterateRagged(fileName, chunkSize))
+    if len(chunks) == 0:
+        raise ValueError('no events found in %s' % fileName)
+
+    events = RaggedEvents.concatenate(chunks)
+
+    elapsed = time.perf_counter() - start
+    if verbose:
+        print('Read %d events from %s in %.2f s (%.0f events/s)' % (len(events), fileName, elapsed,
+                                                                     len(events) / max(elapsed, 1e-9)))
+
+    return events
+
+
+def readGenr8(fileName, chunkSize=100000, verbose=True):
+    '''
+        reads every event in a genr8 .dat file
+        input:
+            fileName (string): name of genr8 .dat file
+            chunkSize (int): number of events parsed at a time
+            verbose (bool): prints the number of events read and the events/second if True
+        returns:
+            3-d array of floats with shape (events, particles, 6)
+    '''
+
+    start = time.perf_counter()
+
+    chunks = list(iterateEvents(fileName, chunkSize))
+    if len(chunks) == 0:
+        raise ValueError('no events found in %s' % fileName)
+
+    events = np.concatenate(chunks)
+
+    elapsed = time.perf_counter() - start
+    if verbose:
+        print('Read %d events from %s in %.2f s (%.0f events/s)' % (len(events), fileName, elapsed,
+                                                                     len(events) / max(elapsed, 1e-9)))
+
+    return events
+
+
+def particleLabels(pids):
+    '''
+        names the particles in an event, particles that show up more than once get numbered (ie pip1, pip2)
+        input:
+            pids (list of ints): geant particle IDs of the particles in one event
+        returns:
+            list of names for the particles
+    '''
+
+    pids = [int(pid) for pid in pids]
+    labels = []
+    counter = {}            # keeps track of how many of each particle we have seen so far
+
+    for pid in pids:
+        name = particleNames.get(pid, 'particle%d' % pid)
+        counter[pid] = counter.get(pid, 0) + 1
+        if pids.count(pid) > 1:
+            name += str(counter[pid])
+        labels.append(name)
+
+    return labels
+
+
+def eventColumns(events, labels=None):
+    '''
+        splits an event array into named columns, ie pip1_px. the columns are views so no data is copied
+        input:
+            events (3-d array of floats): events with shape (events, particles, 6)
+            labels (list of strings): names of the particles, found from the particle IDs of the first event if None
+        returns:
+            dictionary of column name to 1-d array
+    '''
+
+    if labels is None:
+        labels = particleLabels(events[0, :, 0])
+
+    columns = {}
+    for i in range(len(labels)):
+        for j in range(len(particleFields)):
+            columns[labels[i] + '_' + particleFields[j]] = events[:, i, j]
+
+    return columns
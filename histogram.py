@@ -0,0 +1,514 @@
+#! /usr/bin/env python3
+
+'''
+histogram.py is a python module with 1-d and 2-d histograms that have fixed bin edges and can be filled a chunk of
+values at a time, so the values never all have to be in memory at once. histograms with the same binning can be
+added together (ie from different chunks or different processes) and saved to / loaded from .npz files. bootstrap
+histograms also fill replicas of the histogram with Poisson weights in the same pass, which gives the statistical
+uncertainty of every bin without redoing the analysis, and weighted histograms add up a weight for every value
+(ie an acceptance correction) along with the sum of the weights squared for the uncertainties
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import numpy as np
+
+
+class Histogram1D:
+    '''
+        histogram with numBins equal-width bins from low to high. values below low go in the underflow and values at
+        or above high go in the overflow, nan values are skipped
+        numBins (int): number of bins
+        low (float): lower edge of the first bin
+        high (float): upper edge of the last bin
+    '''
+
+    def __init__(self, numBins, low, high):
+        self.numBins = int(numBins)
+        self.low = float(low)
+        self.high = float(high)
+        self.edges = np.linspace(self.low, self.high, self.numBins + 1)
+
+        # bin 0 is the underflow and bin numBins+1 is the overflow
+        self.bins = np.zeros(self.numBins + 2, dtype=np.int64)
+
+    @property
+    def counts(self):
+        '''
+            counts in each bin, without the underflow and overflow
+        '''
+
+        return self.bins[1:-1]
+
+    @property
+    def underflow(self):
+        return self.bins[0]
+
+    @property
+    def overflow(self):
+        return self.bins[-1]
+
+    @property
+    def centers(self):
+        return 0.5 * (self.edges[1:] + self.edges[:-1])
+
+    def binIndex(self, values):
+        '''
+            finds the bin each value falls in, the underflow is bin 0, the overflow is bin numBins+1 and nan values
+            go in bin numBins+2 so they can be dropped
+            input:
+                values (array of floats): values to bin
+            returns:
+                array of ints with the bin of each value
+        '''
+
+        # the bins all have the same width, so the bin is found directly instead of searching the edges. the
+        # position is shifted by one so the underflow is bin 0, and everything past the edges is clipped into the
+        # underflow and overflow
+        values = np.asarray(values)
+        position = np.multiply(values, self.numBins / (self.high - self.low), dtype=np.float64)
+        position += 1.0 - self.low * self.numBins / (self.high - self.low)
+        np.clip(position, 0, self.numBins + 1, out=position)
+        np.nan_to_num(position, copy=False, nan=self.numBins + 2)
+        index = position.astype(np.intp)
+
+        # rounding can put a value right at an edge into the bin next to it, those are moved so every bin holds the
+        # values from its lower edge up to but not including its upper edge. comparisons with nan are False, so the
+        # nan values stay where they are
+        padded = np.concatenate([[-np.inf], self.edges, [np.inf, np.inf]])
+        index -= values < padded[index]
+        index += (values >= padded[index + 1]) & (index <= self.numBins)
+
+        return index
+
+    def fill(self, values):
+        '''
+            adds a chunk of values to the histogram
+            input:
+                values (array of floats): values to add
+        '''
+
+        self.fillIndex(self.binIndex(values))
+
+    def fillIndex(self, index):
+        '''
+            adds a chunk of values whose bins were already found with binIndex
+            input:
+                index (array of ints): bin of each value
+        '''
+
+        self.bins += np.bincount(index, minlength=self.numBins + 3)[:self.numBins + 2]
+
+    def sameBinning(self, other):
+        return self.numBins == other.numBins and self.low == other.low and self.high == other.high
+
+    def __iadd__(self, other):
+        if not isinstance(other, Histogram1D):
+            raise TypeError('cannot add %s to %s' % (type(other).__name__, type(self).__name__))
+        if not self.sameBinning(other):
+            raise ValueError('cannot add histograms with different binning')
+        if self.bins.dtype.kind == 'i' and other.bins.dtype.kind != 'i':
+            raise TypeError('cannot add weighted counts to %s, add it to a WeightedHistogram1D instead'
+                            % type(self).__name__)
+
+        self.bins += other.bins
+
+        return self
+
+    def __add__(self, other):
+        result = self.copy()
+        result += other
+
+        return result
+
+    def copy(self):
+        result = Histogram1D(self.numBins, self.low, self.high)
+        result.bins[:] = self.bins
+
+        return result
+
+    def toArrays(self, prefix=''):
+        '''
+            the arrays that describe the histogram, named for saving in an .npz file
+        '''
+
+        return {prefix + 'bins': self.bins, prefix + 'range': np.array([self.numBins, self.low, self.high])}
+
+    @classmethod
+    def fromArrays(cls, arrays, prefix=''):
+        numBins, low, high = arrays[prefix + 'range']
+        result = cls(int(numBins), low, high)
+        result.bins[:] = arrays[prefix + 'bins']
+
+        return result
+
+    def save(self, fileName):
+        np.savez(fileName, **self.toArrays())
+
+    @classmethod
+    def load(cls, fileName):
+        with np.load(fileName) as arrays:
+            return cls.fromArrays(arrays)
+
+
+class WeightedHistogram1D(Histogram1D):
+    '''
+        Histogram1D where every value is added with a weight, the sum of the weights squared in each bin is kept for
+        the uncertainties
+        numBins (int): number of bins
+        low (float): lower edge of the first bin
+        high (float): upper edge of the last bin
+    '''
+
+    def __init__(self, numBins, low, high):
+        super().__init__(numBins, low, high)
+        self.bins = np.zeros(self.numBins + 2, dtype=np.float64)
+        self.sumw2 = np.zeros(self.numBins + 2, dtype=np.float64)
+
+    @property
+    def errors(self):
+        '''
+            uncertainty of the sum of the weights in each bin, sqrt(sum of w^2)
+        '''
+
+        return np.sqrt(self.sumw2[1:-1])
+
+    def fill(self, values, weights=None):
+        '''
+            adds a chunk of values to the histogram
+            input:
+                values (array of floats): values to add
+                weights (array of floats): weight of each value, 1 for every value if None
+        '''
+
+        self.fillIndex(self.binIndex(values), weights)
+
+    def fillIndex(self, index, weights=None):
+        '''
+            adds a chunk of values whose bins were already found with binIndex
+        '''
+
+        if weights is None:
+            counts = np.bincount(index, minlength=self.numBins + 3)[:self.numBins + 2]
+            self.bins += counts
+            self.sumw2 += counts
+        else:
+            weights = np.asarray(weights, dtype=np.float64)
+            self.bins += np.bincount(index, weights=weights, minlength=self.numBins + 3)[:self.numBins + 2]
+            self.sumw2 += np.bincount(index, weights=weights * weights, minlength=self.numBins + 3)[:self.numBins + 2]
+
+    def __iadd__(self, other):
+        super().__iadd__(other)
+
+        # every value of an unweighted histogram has a weight of 1, so its sum of weights squared is its counts
+        self.sumw2 += getattr(other, 'sumw2', other.bins)
+
+        return self
+
+    def copy(self):
+        result = WeightedHistogram1D(self.numBins, self.low, self.high)
+        result.bins[:] = self.bins
+        result.sumw2[:] = self.sumw2
+
+        return result
+
+    def toArrays(self, prefix=''):
+        arrays = super().toArrays(prefix)
+        arrays[prefix + 'sumw2'] = self.sumw2
+
+        return arrays
+
+    @classmethod
+    def fromArrays(cls, arrays, prefix=''):
+        result = super().fromArrays(arrays, prefix)
+        result.sumw2[:] = arrays[prefix + 'sumw2']
+
+        return result
+
+
+class PoissonBootstrap:
+    '''
+        Poisson(1) weights of every event for a number of bootstrap replicas. the weights are only made for one block
+        of events at a time and every histogram of the block is filled with the same weights, so the replicas of
+        different histograms stay correlated like the real data and the memory used doesn't grow with the number of
+        events
+        replicas (int): number of bootstrap replicas
+        seed (int): seed of the random numbers, the same seed and blockSize always give the same weights
+        blockSize (int): number of events given weights at a time
+    '''
+
+    def __init__(self, replicas, seed=None, blockSize=16384):
+        self.replicas = int(replicas)
+        self.blockSize = int(blockSize)
+        self.rng = np.random.default_rng(seed)
+
+    def blocks(self, numEvents):
+        '''
+            splits numEvents events into blocks and makes the weights of each block
+            input:
+                numEvents (int): number of events
+            returns:
+                generator of (first event, one past the last event, weights with shape (replicas, events in block))
+        '''
+
+        for start in range(0, numEvents, self.blockSize):
+            stop = min(start + self.blockSize, numEvents)
+            yield start, stop, self.rng.poisson(1.0, (self.replicas, stop - start))
+
+
+class BootstrapHistogram1D(Histogram1D):
+    '''
+        Histogram1D that also keeps replicas of itself filled with bootstrap weights (see PoissonBootstrap). the
+        replicas take replicas x bins memory, no matter how many events are filled
+        numBins (int): number of bins
+        low (float): lower edge of the first bin
+        high (float): upper edge of the last bin
+        replicas (int): number of bootstrap replicas
+    '''
+
+    def __init__(self, numBins, low, high, replicas):
+        super().__init__(numBins, low, high)
+        self.replicas = int(replicas)
+        self.replicaBins = np.zeros((self.replicas, self.numBins + 2), dtype=np.int64)
+
+    @property
+    def replicaCounts(self):
+        return self.replicaBins[:, 1:-1]
+
+    @property
+    def errors(self):
+        '''
+            bootstrap uncertainty of the counts in each bin, the spread of the replicas
+        '''
+
+        return np.std(self.replicaCounts, axis=0, ddof=1)
+
+    def band(self, lower=15.87, upper=84.13):
+        '''
+            percentiles of the replicas in each bin, a 68% band by default
+        '''
+
+        return np.percentile(self.replicaCounts, [lower, upper], axis=0)
+
+    def fill(self, values, weights):
+        '''
+            adds a chunk of values to the histogram and its replicas
+            input:
+                values (array of floats): values to add
+                weights (2-d array of ints): bootstrap weight of every value with shape (replicas, values)
+        '''
+
+        self.fillIndex(self.binIndex(values), weights)
+
+    def fillIndex(self, index, weights):
+        '''
+            adds a chunk of values whose bins were already found with binIndex to the histogram and its replicas
+        '''
+
+        super().fillIndex(index)
+
+        # every replica gets its own range of bins, so all the replicas are filled with one bincount
+        offsets = (self.numBins + 3) * np.arange(self.replicas)[:, np.newaxis]
+        counts = np.bincount((index + offsets).ravel(), weights=np.ravel(weights),
+                             minlength=self.replicas * (self.numBins + 3))
+        self.replicaBins += np.rint(counts.reshape(self.replicas, -1)[:, :self.numBins + 2]).astype(np.int64)
+
+    def sameBinning(self, other):
+        return super().sameBinning(other) and self.replicas == getattr(other, 'replicas', None)
+
+    def __iadd__(self, other):
+        super().__iadd__(other)
+        self.replicaBins += other.replicaBins
+
+        return self
+
+    def copy(self):
+        result = BootstrapHistogram1D(self.numBins, self.low, self.high, self.replicas)
+        result.bins[:] = self.bins
+        result.replicaBins[:] = self.replicaBins
+
+        return result
+
+    def toArrays(self, prefix=''):
+        arrays = super().toArrays(prefix)
+        arrays[prefix + 'replicas'] = self.replicaBins
+
+        return arrays
+
+    @classmethod
+    def fromArrays(cls, arrays, prefix=''):
+        numBins, low, high = arrays[prefix + 'range']
+        replicaBins = arrays[prefix + 'replicas']
+        result = cls(int(numBins), low, high, len(replicaBins))
+        result.bins[:] = arrays[prefix + 'bins']
+        result.replicaBins[:] = replicaBins
+
+        return result
+
+
+class Histogram2D:
+    '''
+        2-d histogram with equal-width bins along x and y, each axis has an underflow and an overflow like
+        Histogram1D. pairs with a nan in either value are skipped
+        numBinsX, lowX, highX: binning along x
+        numBinsY, lowY, highY: binning along y
+    '''
+
+    def __init__(self, numBinsX, lowX, highX, numBinsY, lowY, highY):
+        # the axes are 1-d histograms that are only used to find bins
+        self.xAxis = Histogram1D(numBinsX, lowX, highX)
+        self.yAxis = Histogram1D(numBinsY, lowY, highY)
+
+        self.bins = np.zeros((self.xAxis.numBins + 2, self.yAxis.numBins + 2), dtype=np.int64)
+
+    @property
+    def counts(self):
+        '''
+            counts in each bin with shape (x bins, y bins), without the underflows and overflows
+        '''
+
+        return self.bins[1:-1, 1:-1]
+
+    @property
+    def xEdges(self):
+        return self.xAxis.edges
+
+    @property
+    def yEdges(self):
+        return self.yAxis.edges
+
+    def binIndex(self, x, y):
+        '''
+            finds the flattened bin of each (x, y) pair, pairs with a nan are put in an extra bin past the end
+            input:
+                x, y (arrays of floats): values to bin
+            returns:
+                array of ints with the flattened bin of each pair
+        '''
+
+        numX = self.xAxis.numBins + 2
+        numY = self.yAxis.numBins + 2
+
+        ix = self.xAxis.binIndex(x)
+        iy = self.yAxis.binIndex(y)
+        index = ix * numY + iy
+
+        # Histogram1D.binIndex puts nan values one past the overflow
+        index[(ix == numX) | (iy == numY)] = numX * numY
+
+        return index
+
+    def fill(self, x, y, symmetric=False):
+        '''
+            adds a chunk of (x, y) pairs to the histogram
+            input:
+                x, y (arrays of floats): values to add
+                symmetric (bool): also adds every pair with x and y swapped, ie for two identical particles
+        '''
+
+        self.fillIndex(self.binIndex(x, y))
+        if symmetric:
+            self.fillIndex(self.binIndex(y, x))
+
+    def fillIndex(self, index):
+        '''
+            adds a chunk of pairs whose flattened bins were already found with binIndex
+        '''
+
+        size = self.bins.size
+        self.bins += np.bincount(index, minlength=size + 1)[:size].reshape(self.bins.shape)
+
+    def sameBinning(self, other):
+        return self.xAxis.sameBinning(other.xAxis) and self.yAxis.sameBinning(other.yAxis)
+
+    def __iadd__(self, other):
+        if not self.sameBinning(other):
+            raise ValueError('cannot add histograms with different binning')
+
+        self.bins += other.bins
+
+        return self
+
+    def __add__(self, other):
+        result = self.copy()
+        result += other
+
+        return result
+
+    def copy(self):
+        result = Histogram2D(self.xAxis.numBins, self.xAxis.low, self.xAxis.high,
+                             self.yAxis.numBins, self.yAxis.low, self.yAxis.high)
+        result.bins[:] = self.bins
+
+        return result
+
+    def toArrays(self, prefix=''):
+        '''
+            the arrays that describe the histogram, named for saving in an .npz file
+        '''
+
+        return {prefix + 'bins': self.bins,
+                prefix + 'range': np.array([self.xAxis.numBins, self.xAxis.low, self.xAxis.high,
+                                            self.yAxis.numBins, self.yAxis.low, self.yAxis.high])}
+
+    @classmethod
+    def fromArrays(cls, arrays, prefix=''):
+        numBinsX, lowX, highX, numBinsY, lowY, highY = arrays[prefix + 'range']
+        result = cls(int(numBinsX), lowX, highX, int(numBinsY), lowY, highY)
+        result.bins[:] = arrays[prefix + 'bins']
+
+        return result
+
+    def save(self, fileName):
+        np.savez(fileName, **self.toArrays())
+
+    @classmethod
+    def load(cls, fileName):
+        with np.load(fileName) as arrays:
+            return cls.fromArrays(arrays)
+
+
+def saveHistograms(fileName, histograms):
+    '''
+        saves many histograms to one .npz file
+        input:
+            fileName (string): name of .npz file
+            histograms (dictionary): histogram name to Histogram1D or Histogram2D
+    '''
+
+    arrays = {}
+    for name, hist in histograms.items():
+        arrays.update(hist.toArrays(name + '.'))
+
+    np.savez(fileName, **arrays)
+
+
+def loadHistograms(fileName):
+    '''
+        loads the histograms saved with saveHistograms
+        input:
+            fileName (string): name of .npz file
+        returns:
+            dictionary of histogram name to histogram
+    '''
+
+    histograms = {}
+    with np.load(fileName) as arrays:
+        for key in arrays.files:
+            if key.endswith('.range'):
+                name = key[:-len('.range')]
+
+                # 1-d histograms store 3 numbers for their binning and 2-d histograms store 6, bootstrap histograms
+                # also store their replicas and weighted histograms their sum of weights squared
+                if name + '.replicas' in arrays.files:
+                    histograms[name] = BootstrapHistogram1D.fromArrays(arrays, name + '.')
+                elif name + '.sumw2' in arrays.files:
+                    histograms[name] = WeightedHistogram1D.fromArrays(arrays, name + '.')
+                elif len(arrays[key]) == 3:
+                    histograms[name] = Histogram1D.fromArrays(arrays, name + '.')
+                else:
+                    histograms[name] = Histogram2D.fromArrays(arrays, name + '.')
+
+    return histograms
@@ -0,0 +1,123 @@
+#! /usr/bin/env python3
+
+'''
+histogramPlotting.py is a python module (and script) that renders histograms that were already filled (see
+histogram.py) to .png files. it never touches pyplot: every worker process draws on one reused matplotlib Figure
+with the Agg backend, and the plots are split between the workers, so a large batch of plots only takes seconds
+
+usage:
+    python histogramPlotting.py n3pi_histograms.npz [-j number_of_workers]
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import os
+import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import histogram
+
+
+def drawPlot(fig, plot, hist):
+    '''
+        draws one histogram on a cleared figure
+        input:
+            fig (Figure): figure to draw on
+            plot (dictionary): how to draw the histogram, the keys are 'output' (name of .png file) and optionally
+                               'title', 'xlabel', 'ylabel', 'xlim' and 'ylim'
+            hist (Histogram1D or Histogram2D): histogram to draw
+    '''
+
+    fig.clf()
+    ax = fig.add_subplot()
+
+    if isinstance(hist, histogram.Histogram2D):
+        mesh = ax.pcolormesh(hist.xEdges, hist.yEdges, hist.counts.T, cmap='viridis')
+        fig.colorbar(mesh, ax=ax, label='Counts')
+    else:
+        ax.stairs(hist.counts, hist.edges, fill=True)
+
+        # bootstrap and weighted histograms also get a band of the uncertainty in each bin
+        if isinstance(hist, (histogram.BootstrapHistogram1D, histogram.WeightedHistogram1D)):
+            errors = hist.errors
+            ax.stairs(hist.counts + errors, hist.edges, baseline=hist.counts - errors, fill=True, color='black',
+                      alpha=0.3)
+
+    if 'xlim' in plot:
+        ax.set_xlim(*plot['xlim'])
+    if 'ylim' in plot:
+        ax.set_ylim(*plot['ylim'])
+    ax.set_xlabel(plot.get('xlabel', ''))
+    ax.set_ylabel(plot.get('ylabel', ''))
+    ax.set_title(plot.get('title', ''))
+
+    fig.savefig(plot['output'])
+
+
+def renderGroup(plots, histograms):
+    '''
+        renders a list of plots one after another on the same figure
+        input:
+            plots (list of dictionaries): plots to draw, each one also has a 'histogram' key with the histogram name
+            histograms (dictionary): histogram name to histogram
+        returns:
+            list of the .png files that were written
+    '''
+
+    fig = Figure()
+    FigureCanvasAgg(fig)
+
+    for plot in plots:
+        drawPlot(fig, plot, histograms[plot['histogram']])
+
+    return [plot['output'] for plot in plots]
+
+
+def renderPlots(plots, histograms, workers=None):
+    '''
+        renders every plot, split between worker processes. the workers are forked so this also works when called
+        from a script without a main guard, where forking isn't available the plots are rendered in this process
+        input:
+            plots (list of dictionaries): plots to draw (see drawPlot), each with a 'histogram' key
+            histograms (dictionary): histogram name to histogram
+            workers (int): number of worker processes, uses every core if None
+        returns:
+            list of the .png files that were written
+    '''
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(plots)))
+
+    if workers == 1 or 'fork' not in multiprocessing.get_all_start_methods():
+        return renderGroup(plots, histograms)
+
+    # every worker gets every n-th plot and only the histograms those plots need
+    groups = [plots[i::workers] for i in range(workers)]
+    needed = [{plot['histogram']: histograms[plot['histogram']] for plot in group} for group in groups]
+
+    outputs = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as pool:
+        for written in pool.map(renderGroup, groups, needed):
+            outputs += written
+
+    return outputs
+
+
+# main code block
+if __name__ == '__main__':
+    inputName = sys.argv[1] if len(sys.argv) > 1 else 'n3pi_histograms.npz'
+    workers = None
+    if '-j' in sys.argv:
+        workers = int(sys.argv[sys.argv.index('-j') + 1])
+
+    # plots every histogram in the file with its name as the title
+    histograms = histogram.loadHistograms(inputName)
+    plots = [{'histogram': name, 'output': name + '.png', 'title': name} for name in histograms]
+
+    outputs = renderPlots(plots, histograms, workers)
+    print('Rendered %d plots from %s' % (len(outputs), inputName))
@@ -11,153 +11,150 @@ PHZ 4151C
 Feb 21, 2021
 '''
 
+import os
 import numpy as np
 import matplotlib.pyplot as plt
+import monteCarlo
 
 def withinSphere(arg, dim):
     '''
-        evaluates whether given point is within a {dim}-dimenional sphere
+        evaluates whether given points are within a {dim}-dimenional sphere
         input:
-            arguement (list of floats): represents point to evaluate
-            dim (int): number of elements in arguements, represents number of dimensions for sphere
+            arguement (2-d array of floats): points to evaluate with shape (points, dim)
+            dim (int): number of coordinates of each point, represents number of dimensions for sphere
         returns:
-            1 if the point (arguement) is within the sphere, 0 if it isn't
+            array with 1 for the points (arguements) that are within the sphere, 0 for the ones that aren't
     '''
 
-    # value will store the result of the sum of the arguements squared to check if it would be inside the {dim}-dimensional sphere
-    value = 0
+    # value stores the sum of the coordinates squared of every point to check if it would be inside the {dim}-dimensional sphere
+    value = np.einsum('ij,ij->i', arg, arg)
 
-    for i in range(dim):
-        value += (arg[i]**2)
+    # a point is within the sphere if the value is less than or equal to 1, then the result is 1, if not, it is 0
+    return (value <= 1).astype(np.float64)
 
-    # checks to see if this point is within the sphere, it is within the sphere if it less than or equal to 1
-    # if it is, result of function is 1, if not, it is 0
-    if value <= 1:
-        result = 1
-    else:
-        result = 0
 
-    return result
+def withinSpheres(arg, dim):
+    '''
+        evaluates whether given points are within the spheres of every dimension from 0 to {dim}, using the first d
+        coordinates of the points for the d-dimensional sphere
+        input:
+            arguement (2-d array of floats): points to evaluate with shape (points, dim)
+            dim (int): number of coordinates of each point, the largest number of dimensions
+        returns:
+            (points, dim + 1) array, column d has 1 for the points within the d-dimensional sphere and 0 for the ones
+            that aren't
+    '''
+
+    # the sum of the first d coordinates squared of every point for every d, as prefix sums along the coordinates
+    value = np.zeros((len(arg), dim + 1))
+    np.cumsum(arg**2, axis=1, out=value[:, 1:])
+
+    return (value <= 1).astype(np.float64)
 
 
-def montecarloIntegration(func, dim, lim, N):
+def montecarloIntegration(func, dim, lim, N, workers=1, seed=None, method='uniform'):
     '''
-        based on textbook function for the Monte Carlo mean-value integration method of any dimension
+        Monte Carlo mean-value integration method of any dimension. the sample points are drawn and evaluated in blocks
+        (see monteCarlo.py), so only running sums are kept instead of every sample point. stratified or importance
+        sampling can be used instead of uniform sampling to get a smaller error with the same number of points
         input:
-            func (function): user-defined function to be integrated over, takes in a list as an arguement
+            func (function): user-defined function to be integrated over, takes in a (points, dim) array of sample points
+                             and dim and returns an array with the value for each point
             dim (int): number of dimensions being integrated over
             lim (2-d list of floats): stores limits of integration for dim dimensions. first index represents the dimension,
                                       second index represents either the lower limit (element 0) or upper limit (element 1) of integration
             N (int): number of sample points
+            workers (int): number of worker processes, each with its own stream of random numbers, every core if None
+            seed (int): seed of the random numbers
+            method (string): 'uniform', 'stratified', 'importance', 'sobol' or 'halton' sampling
         returns:
-            result of integral and a list of lists of random values used as arguements for the function
+            result of integral and the error on the integral
     '''
-    I = 1.0 / N      # stores value of integral, starts by storing 1/N, which helps set up finding average of function
-    summation = 0    # stores value of summation for N random arguemnts sent to function to find average value of function
-    argList = []     # stores lists of random values used as arguements for the function
 
-    # multiplies inetgral value by the subtraction of lower limit of integral from upper limit of integral for the ith dimension
-    for i in range(dim):
-        I *= (lim[i][1] - lim[i][0])
+    I, sigma, stats = monteCarlo.integrate(func, dim, lim, int(N), seed, workers, method=method)
 
-    for i in range(N):
-        # stores arguements to send to function for one iteration (ie sample point)
-        arg = []
+    return I, sigma
 
-        # generating dim number of random arguements within the bounds of integration for the jth dimension
-        # to send to function being integrated
-        for j in range(dim):
-            arg.append(np.random.uniform(lim[j][0], lim[j][1]))
-
-        # adds the result of function with these randomly produced arguements
-        summation += func(arg, dim)
-
-        #stores this iteration's line up of random numbers to find error
-        argList.append(arg)
+def volumeSweep(maxDim, lim, N, workers=1, seed=None):
+    '''
+        volumes of the spheres of every dimension from 0 to maxDim with the Monte Carlo mean-value method, all from
+        the same (N, maxDim) set of sample points instead of new sample points for every dimension
+        input:
+            maxDim (int): largest number of dimensions
+            lim (2-d list of floats): limits of integration for maxDim dimensions
+            N (int): number of sample points
+            workers (int): number of worker processes, every core if None
+            seed (int): seed of the random numbers
+        returns:
+            lists with the volume and the error on the volume for every dimension
+    '''
 
-    # multiplies result of sum into value of integral
-    I *= summation
+    volumes, errors, stats = monteCarlo.integrateSweep(withinSpheres, maxDim, lim, int(N), seed, workers)
 
-    return I, argList
+    return volumes.tolist(), errors.tolist()
 
-def errorMonteCarlo(func, arg, dim, lim, N):
+def errorMonteCarlo(func, dim, lim, N, workers=1, method='uniform'):
     '''
-        find the error on the integral when using the Monte Carlo mean-value method
+        find the error on the integral when using the Monte Carlo mean-value method with N sample points,
+        sigma = V * sqrt(var(f) / N). the running mean and variance are recorded as the points are sampled, so the
+        errors for a whole list of N come from one pass over the largest N
         input:
-            func (function): user-defined function to be integrated over, takes in a list as an arguement
-            arg (2-d list): stores arguements used to find value of integral using the montecarloIntegration function. first index
-                                represents which sample point out of N is being evaluated, the second index represents a specific
-                                coordinate value for that sample point
+            func (function): user-defined function to be integrated over, takes in a (points, dim) array of sample points
             dim (int): number of dimensions being integrated over
             lim (2-d list): stores limits of integration for dim dimensions. first index represents the dimension,
                                       second index represents either the lower limit (element 0) or upper limit (element 1) of integration
-            N (int): number of sample points
+            N (int or list of ints): number of sample points, or a list of numbers of sample points
+            workers (int): number of worker processes
+            method (string): 'uniform', 'stratified', 'importance', 'sobol' or 'halton' sampling
         returns:
-            error on the integral estimation
+            error on the integral estimation, a list with the error for every number of sample points if N is a list
     '''
 
-    var_term1 = 1. / N          # will store the expectation value of func^2 to find variance of func
-    var_term2 = 1. / (N**2)     # will store the expectation value squared of func to find variance of func
-    summation1 = 0              # will store sum of func values for given arg values to calculate 1st term of variance of func
-    summation2 = 0.             # will store sum of func values for given arg values to calculate 2nd term of variance of func
-    sigma = 1. / np.sqrt(N)     # will store error
-
-    # multiplies error value by the subtraction of lower limit of integral from upper limit of integral for the ith dimension
-    for j in range(dim):
-        sigma *= (lim[j][1] - lim[j][0])
-
-    # finds values of function for a given arguement to add to summations for the terms in thhe variance of func
-    for i in range(int(N)):
-        val = func(arg[j], dim)
-        summation1 += val ** 2
-        summation2 += val
-
-    # multiply in the respective summations to find the two terms of the variance
-    var_term1 *= summation1
-    var_term2 *= summation2
-
-    # combine the two variance terms and take square root to find the error on func
-    sigma *= np.sqrt(var_term1 - var_term2)
+    checkpoints = [int(n) for n in np.atleast_1d(N)]
+    errors = [sigma for I, sigma, stats in monteCarlo.integrateCheckpoints(func, dim, lim, checkpoints, None, workers,
+                                                                            method=method)]
 
-    return sigma
+    return errors if np.ndim(N) > 0 else errors[0]
 
 
 # main code block
 numPoints = 1000000               # number of sampling points for integration
 numDimension = 10                 # number of dimensions hypersphere is
 limit = [-1,1]                    # bounds of integration, -1 to 1 for all dimensions
+workers = os.cpu_count()          # number of worker processes for the integration
 
 limit_10d = []                    # list containing limits of integration for 10 dimensions
-arguements_10d = []               # list containing arguements used for the integration in dimensions
 
 # limits of integration for all 10 dimensions are -1 to 1
 for i in range(numDimension):
     limit_10d.append(limit)
 
 # calculate volume of 10-d hypersphere
-volume_10d, arguements_10d = montecarloIntegration(withinSphere, numDimension, limit_10d, numPoints)
+volume_10d, error_10d = montecarloIntegration(withinSphere, numDimension, limit_10d, numPoints, workers)
 
-print(f'The volume of a 10-d hypersphere is {volume_10d}\n')
+print(f'The volume of a 10-d hypersphere is {volume_10d} +- {error_10d}\n')
+
+# compare the sampling methods by their variance per sample point, the number of points needed for a 0.1% error on
+# the volume is the variance per point / (0.001 * volume)^2
+print(f'{"Method":>12} {"Volume":>10} {"Error":>10} {"Variance/point":>15} {"Points for 0.1%":>16}')
+for method in monteCarlo.methods:
+    I, sigma, stats = monteCarlo.integrate(withinSphere, numDimension, limit_10d, numPoints, None, workers, method=method)
+    print(f'{method:>12} {I:10.4f} {sigma:10.4f} {stats.variancePerPoint:15.4g} {stats.variancePerPoint / (1e-3 * I)**2:16.3g}')
+print()
 
 lowerDim = 0
 upperDim = 12
 dimensionRange = [*range(lowerDim, upperDim)]  # range of dimensions from 0 to 12
-volumes = []                                   # store volumes of spheres for given dimensions in dimensionRange
-arguments = []                                 # stores arguements used to calculate the volume of spheres for given dimensions
+limit_list = []                                # list containing limits of integration for the largest dimension
+for j in range(len(dimensionRange)):
+    limit_list.append(limit)
 
-for i in dimensionRange:
-    # creating a temporary list of limits for each iteration
-    limit_list = []
-    # appends appropriate number of limits for a given dimension to send into Monte Carlo function
-    for j in range(len(dimensionRange)):
-        limit_list.append(limit)
-    # find volumes for each dimension in dimensionRange
-    # saves these to temporary variables to then append to their respective lists
-    tempVolume, tempArg = montecarloIntegration(withinSphere, dimensionRange[i], limit_list, numPoints)
-    volumes.append(tempVolume)
-    arguments.append(tempArg)
+# find volumes (and their errors) for each dimension in dimensionRange, all from the same set of sample points, the
+# d-dimensional sphere uses the first d coordinates of every point
+volumes, volumeErrors = volumeSweep(dimensionRange[-1], limit_list, numPoints, workers)
 
-    print(f'The (hyper)volume of a {i}-d sphere is approximately {volumes[i]:.4f}')
+for i in dimensionRange:
+    print(f'The (hyper)volume of a {i}-d sphere is approximately {volumes[i]:.4f} +- {volumeErrors[i]:.4f}')
 
 
 #graph of hypervolume v. dimension
@@ -179,17 +176,15 @@ number = int((numPoints - lowerNumPoints) / step)   # calculates how many differ
 # generates sample point range from {lowerNumPoints} to {numPoints} in steps of {step} as a list
 numPointsRange = np.linspace(lowerNumPoints, numPoints, number).tolist()
 
-errors_10d = []             # stores the errors in the estimation of integral for 10-d hypersphere
-
 print('\nFor a 10-d hypersphere, the error on the volume is:')
 
-counter = 0     # for the purpose of printing out errors
+# stores the errors in the estimation of integral for 10-d hypersphere for every number of sample points, recorded
+# along the way while sampling the largest number of points once
+errors_10d = errorMonteCarlo(withinSphere, numDimension, limit_10d, numPointsRange, workers)
+
+for i, error in zip(numPointsRange, errors_10d):
+    print(f'{error} for {i} steps')
 
-for i in numPointsRange:
-    # find error in integral result for 10-d hypersphere for i sample points
-    errors_10d.append(errorMonteCarlo(withinSphere, arguements_10d, numDimension, limit_10d, i))
-    print(f'{errors_10d[int(counter)]} for {i} steps')
-    counter += 1
 
 #graph of error v. sample points
 plt.plot(numPointsRange, errors_10d)
@@ -0,0 +1,115 @@
+#! /usr/bin/env python3
+
+'''
+kinematicFit.py is a python module that does a constrained kinematic fit of the measured pions in every event so
+that the missing mass comes out exactly equal to the mass of the recoil neutron. the fit uses Lagrange multipliers
+with the constraint linearized around the current fit values, and every iteration is done for all the events at
+once with batched numpy linear algebra instead of looping over the events
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import numpy as np
+
+pionMass = 0.13957      # mass of a charged pion in GeV
+neutronMass = 0.93957   # mass of a neutron in GeV
+
+
+def momentumVariances(pions, fraction=0.02, floor=0.005):
+    '''
+        simple resolution model, every momentum component is smeared by a fraction of the particle's momentum
+        input:
+            pions (3-d array of floats): measured four-vectors with shape (events, pions, 4)
+            fraction (float): resolution as a fraction of the total momentum
+            floor (float): smallest resolution in GeV, so slow particles still have some uncertainty
+        returns:
+            2-d array of variances with shape (events, 3 * pions) in the order px py pz of each pion
+    '''
+
+    momentum = np.sqrt(np.sum(pions[..., :3]**2, axis=-1))
+    sigma = np.sqrt((fraction * momentum)**2 + floor**2)
+
+    return np.repeat(sigma**2, 3, axis=1)
+
+
+def missingMassFit(initial, pions, variances, mass=neutronMass, pionMasses=pionMass, iterations=20,
+                   tolerance=1e-9):
+    '''
+        fits the pion momenta of every event so the missing mass is equal to mass, keeping the fitted momenta as
+        close as possible to the measured ones given their uncertainties
+        input:
+            initial (array of floats): four-vector of the beam plus target, shape (events, 4) or (4,)
+            pions (3-d array of floats): measured four-vectors of the pions with shape (events, pions, 4)
+            variances (array of floats): uncertainties of the measured momenta in the order px py pz of each pion,
+                                         either variances with shape (events, 3 * pions) or full covariance
+                                         matrices with shape (events, 3 * pions, 3 * pions)
+            mass (float): mass the missing four-momentum is constrained to
+            pionMasses (float or array of floats): masses of the pions, used to find their fitted energies
+            iterations (int): largest number of iterations
+            tolerance (float): the fit stops once the constraint is satisfied to this accuracy in GeV^2 for every
+                               event
+        returns:
+            fitted pion four-vectors with shape (events, pions, 4), fitted missing four-vectors with shape
+            (events, 4), chi^2 of each event, and whether the fit of each event converged
+    '''
+
+    numEvents, numPions = pions.shape[0], pions.shape[1]
+    initial = np.broadcast_to(initial, (numEvents, 4))
+    pionMasses = np.broadcast_to(np.asarray(pionMasses, dtype=np.float64), (numPions,))
+    fullCovariance = (np.ndim(variances) == 3)
+
+    measured = pions[..., :3].reshape(numEvents, 3 * numPions)
+    fitted = measured.copy()
+
+    multiplier = np.zeros(numEvents)                # Lagrange multiplier of every event
+    weight = np.ones(numEvents)                     # D V D^T of every event
+    converged = np.zeros(numEvents, dtype=bool)
+
+    # events whose constraint is satisfied drop out, so later iterations only work on the events still being fit
+    active = np.arange(numEvents)
+
+    for i in range(iterations):
+        momenta = fitted[active].reshape(len(active), numPions, 3)
+        energies = np.sqrt(np.sum(momenta**2, axis=-1) + pionMasses**2)
+
+        # missing four-momentum and how far it is from satisfying the constraint
+        missingE = initial[active, 3] - np.sum(energies, axis=1)
+        missingP = initial[active, :3] - np.sum(momenta, axis=1)
+        constraint = missingE**2 - np.sum(missingP**2, axis=1) - mass**2
+
+        # derivative of the constraint with respect to every fitted momentum component, shape (events, 3 * pions)
+        derivative = 2.0 * missingP[:, np.newaxis, :] - 2.0 * missingE[:, np.newaxis, np.newaxis] * momenta \
+                     / energies[..., np.newaxis]
+        derivative = derivative.reshape(len(active), 3 * numPions)
+
+        # with the constraint linearized around the current fit, the Lagrange multiplier of every event is
+        # lambda = (D V D^T)^-1 (g + D (measured - fitted)) and the new fit is measured - V D^T lambda
+        if fullCovariance:
+            covDerivative = np.matmul(variances[active], derivative[..., np.newaxis])[..., 0]
+        else:
+            covDerivative = variances[active] * derivative
+        weight[active] = np.sum(derivative * covDerivative, axis=1)
+        residual = constraint + np.sum(derivative * (measured[active] - fitted[active]), axis=1)
+        multiplier[active] = residual / weight[active]
+
+        fitted[active] = measured[active] - covDerivative * multiplier[active, np.newaxis]
+
+        done = np.abs(constraint) < tolerance
+        converged[active[done]] = True
+        active = active[~done]
+        if len(active) == 0:
+            break
+
+    # chi^2 = lambda^2 (D V D^T), which is (measured - fitted)^T V^-1 (measured - fitted) for one constraint
+    chi2 = multiplier**2 * weight
+
+    # fitted four-vectors of the pions and of the missing particle
+    momenta = fitted.reshape(numEvents, numPions, 3)
+    fittedPions = np.empty_like(pions, dtype=np.float64)
+    fittedPions[..., :3] = momenta
+    fittedPions[..., 3] = np.sqrt(np.sum(momenta**2, axis=-1) + pionMasses**2)
+    missing = initial - np.sum(fittedPions, axis=1)
+
+    return fittedPions, missing, chi2, converged
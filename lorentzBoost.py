@@ -0,0 +1,192 @@
+#! /usr/bin/env python3
+
+'''
+lorentzBoost.py is a python module that boosts whole arrays of four-vectors with shape (events, 4) into the rest
+frame of a parent particle (ie the 3 pion system) and finds the decay angles cos(theta) and phi of a daughter in
+the helicity frame or the Gottfried-Jackson frame. all the work is done in buffers that are allocated once and
+reused for every chunk of events, so large samples don't allocate big temporary arrays
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import numpy as np
+
+
+class BoostBuffers:
+    '''
+        preallocated work space for boosting and finding angles of up to size events at a time
+        size (int): largest number of events in a chunk
+    '''
+
+    def __init__(self, size):
+        self.size = size
+
+        self.beta = np.empty((size, 3))             # velocity of the parent
+        self.beam = np.empty((size, 4))             # four-vectors boosted into the parent rest frame
+        self.recoil = np.empty((size, 4))
+        self.daughter = np.empty((size, 4))
+
+        self.x = np.empty((size, 3))                # axes of the frame the angles are measured in
+        self.y = np.empty((size, 3))
+        self.z = np.empty((size, 3))
+
+        self.scalars = np.empty((4, size))          # scratch space for one number per event
+
+    def view(self, n):
+        '''
+            buffers for the first n events, for chunks smaller than size
+        '''
+
+        if n > self.size:
+            raise ValueError('chunk of %d events is bigger than the buffers (%d events)' % (n, self.size))
+
+        result = BoostBuffers.__new__(BoostBuffers)
+        result.size = n
+        for name in ['beta', 'beam', 'recoil', 'daughter', 'x', 'y', 'z']:
+            setattr(result, name, getattr(self, name)[:n])
+        result.scalars = self.scalars[:, :n]
+
+        return result
+
+
+def dot(a, b, out):
+    '''
+        dot product of the rows of two arrays of 3-vectors, written into out
+    '''
+
+    return np.einsum('ij,ij->i', a[:, :3], b[:, :3], out=out)
+
+
+def normalize(vectors, scratch):
+    '''
+        scales the rows of an array of 3-vectors to unit length in place
+    '''
+
+    np.sqrt(dot(vectors, vectors, scratch), out=scratch)
+    vectors /= scratch[:, np.newaxis]
+
+
+def cross(a, b, out, scratch):
+    '''
+        cross product of the rows of two arrays of 3-vectors, written into out (which can't be a or b)
+    '''
+
+    for i in range(3):
+        j = (i + 1) % 3
+        k = (i + 2) % 3
+        np.multiply(a[:, j], b[:, k], out=out[:, i])
+        np.multiply(a[:, k], b[:, j], out=scratch)
+        out[:, i] -= scratch
+
+    return out
+
+
+def restFrameVelocity(parent, out):
+    '''
+        velocity of the parent, the boost into its rest frame
+        input:
+            parent (2-d array of floats): four-vectors of the parent with shape (events, 4)
+            out (2-d array of floats): array with shape (events, 3) to write the velocity into
+    '''
+
+    np.divide(parent[:, :3], parent[:, 3:], out=out)
+
+    return out
+
+
+def boost(p4, beta, out, buffers):
+    '''
+        boosts four-vectors into the frame moving with velocity beta. out can be p4 itself to boost in place
+        input:
+            p4 (2-d array of floats): four-vectors with shape (events, 4)
+            beta (2-d array of floats): velocity of the new frame with shape (events, 3)
+            out (2-d array of floats): array with shape (events, 4) to write the boosted four-vectors into
+            buffers (BoostBuffers): work space with room for the events
+        returns:
+            out
+    '''
+
+    gamma, betaP, factor, scratch = buffers.scalars[:, :len(p4)]
+
+    # gamma = 1 / sqrt(1 - beta^2)
+    dot(beta, beta, gamma)
+    np.subtract(1.0, gamma, out=gamma)
+    np.sqrt(gamma, out=gamma)
+    np.divide(1.0, gamma, out=gamma)
+
+    dot(beta, p4, betaP)
+
+    # p' = p + ((gamma - 1) (beta . p) / beta^2 - gamma E) beta, where (gamma - 1) / beta^2 = gamma^2 / (gamma + 1)
+    # so a parent at rest doesn't divide by zero
+    np.add(gamma, 1.0, out=scratch)
+    np.multiply(gamma, gamma, out=factor)
+    factor /= scratch
+    factor *= betaP
+    np.multiply(gamma, p4[:, 3], out=scratch)
+    factor -= scratch
+
+    # E' = gamma (E - beta . p), found before the momentum is changed in case the boost is in place
+    np.subtract(p4[:, 3], betaP, out=scratch)
+    np.multiply(gamma, scratch, out=out[:, 3])
+
+    for i in range(3):
+        np.multiply(factor, beta[:, i], out=scratch)
+        np.add(p4[:, i], scratch, out=out[:, i])
+
+    return out
+
+
+def decayAngles(beam, recoil, parent, daughter, frame='helicity', buffers=None, out=None):
+    '''
+        finds the decay angles of a daughter of the parent in the parent rest frame. in both frames the y axis is
+        the normal to the production plane, beam x (-recoil) in the parent rest frame, and x = y cross z
+            helicity frame: z is the direction of the parent in the overall center of mass frame, which is the
+                            opposite of the recoil direction in the parent rest frame
+            Gottfried-Jackson frame: z is the direction of the beam in the parent rest frame
+        input:
+            beam, recoil, parent, daughter (2-d arrays of floats): four-vectors with shape (events, 4)
+            frame (string): 'helicity' or 'gj'
+            buffers (BoostBuffers): work space with room for the events, allocated if None
+            out (2-d array of floats): array with shape (2, events) to write cos(theta) and phi into
+        returns:
+            out, with cos(theta) in the first row and phi (in radians) in the second row
+    '''
+
+    n = len(parent)
+    buffers = BoostBuffers(n) if buffers is None else buffers.view(n)
+    if out is None:
+        out = np.empty((2, n))
+    scratch = buffers.scalars[3]
+
+    restFrameVelocity(parent, buffers.beta)
+    boost(beam, buffers.beta, buffers.beam, buffers)
+    boost(recoil, buffers.beta, buffers.recoil, buffers)
+    boost(daughter, buffers.beta, buffers.daughter, buffers)
+
+    # the recoil is turned around in place, it is only needed as -recoil from here on
+    buffers.recoil[:, :3] *= -1.0
+
+    if frame == 'helicity':
+        buffers.z[:] = buffers.recoil[:, :3]
+    elif frame == 'gj':
+        buffers.z[:] = buffers.beam[:, :3]
+    else:
+        raise ValueError("frame has to be 'helicity' or 'gj'")
+    normalize(buffers.z, scratch)
+
+    cross(buffers.beam, buffers.recoil, buffers.y, scratch)
+    normalize(buffers.y, scratch)
+    cross(buffers.y, buffers.z, buffers.x, scratch)
+
+    # cos(theta) is the daughter direction along z, phi is the angle of the daughter around z measured from x
+    np.sqrt(dot(buffers.daughter, buffers.daughter, scratch), out=scratch)
+    dot(buffers.daughter, buffers.z, out[0])
+    out[0] /= scratch
+
+    dot(buffers.daughter, buffers.y, out[1])
+    dot(buffers.daughter, buffers.x, scratch)
+    np.arctan2(out[1], scratch, out=out[1])
+
+    return out
@@ -0,0 +1,455 @@
+#! /usr/bin/env python3
+
+'''
+monteCarlo.py is a python module for Monte Carlo mean-value integration of functions of any number of dimensions.
+the sample points are drawn a block at a time as (points, dimensions) arrays, the integrand is evaluated on a whole
+block at once, and only the running number of points, mean and sum of squared deviations are kept, so the memory
+used doesn't depend on the number of points. the points can be split between worker processes that each have their
+own independent stream of random numbers (from np.random.SeedSequence), and their sums are combined at the end. a
+copy of the running sums can be kept at checkpoints along the way, which gives the integral and its error for every
+smaller number of points from the same single pass.
+
+besides plain uniform sampling there are two variance-reduced methods:
+    stratified: the region is split into a grid of equal cells along the first few dimensions and every round of
+                sampling puts one point in every cell, the mean of a round is one estimate of the integral. this only
+                helps integrands that change a lot along those single dimensions, for an integrand that depends on
+                all the coordinates together (ie the radius of a hypersphere) it removes very little variance, about
+                3% for the 10-d sphere
+    importance: the points are drawn from a density that is peaked at the centre of the region, (1 - |t|)^a along
+                every axis with t from -1 to 1, and weighted by 1 / density. the exponent a is picked from a short pilot
+                run as the one with the smallest variance
+and two randomized quasi-Monte Carlo methods (see quasiRandom.py):
+    sobol, halton: every one of qmcReplicas independently scrambled copies of the low-discrepancy sequence gives one
+                   estimate of the integral, the mean of volume * f over its points, and the error comes from the
+                   spread of the estimates. for smooth integrands it falls close to 1/N instead of 1/sqrt(N)
+every method keeps the running stats of its estimates of the integral, so the variance per sample point can be
+compared between methods, the number of points needed for an error sigma is N = variance per point / sigma^2 (for
+the quasi-Monte Carlo methods the variance per point itself gets smaller with more points).
+
+integrals over the first 0, 1, ..., d dimensions of one set of points (ie the volumes of spheres of every dimension
+up to d) can all be found at once with integrateSweep, which draws the (points, d) block once for all of them
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import os
+import pickle
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import quasiRandom
+
+blockSize = 1 << 16     # number of sample points drawn and evaluated at a time
+methods = ('uniform', 'stratified', 'importance', 'sobol', 'halton')
+
+strataPerAxis = 4       # number of cells along every stratified dimension
+maxStrata = 4096        # largest number of cells, the dimensions after that many cells aren't stratified
+minRounds = 32          # fewest rounds of stratified sampling at the first checkpoint, so its variance can be found
+importanceExponents = (0.0, 0.5, 1.0, 1.5, 2.0, 3.0, 4.0)   # exponents tried in the importance sampling pilot run
+qmcReplicas = 16        # number of independently scrambled copies of a quasi-random sequence
+
+
+class RunningStats:
+    '''
+        number of values, mean and sum of squared deviations from the mean of a stream of values, updated a block
+        of values at a time. two of them can be merged, ie from different worker processes. the values can also be
+        rows of several values (ie one integral per column), then the mean and variance are arrays with one per column
+        pointsPerValue (int): number of sample points that went into every value, ie a whole round of stratified
+                              sampling is one value
+    '''
+
+    def __init__(self, pointsPerValue=1):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0       # sum of (value - mean)^2
+        self.pointsPerValue = pointsPerValue
+
+    def add(self, values):
+        '''
+            adds a block of values
+        '''
+
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+
+        block = RunningStats(self.pointsPerValue)
+        block.n = len(values)
+        block.mean = np.mean(values, axis=0)
+        block.m2 = np.sum((values - block.mean)**2, axis=0)
+        self.merge(block)
+
+    def merge(self, other):
+        '''
+            combines the values of another RunningStats into this one
+        '''
+
+        n = self.n + other.n
+        if n == 0:
+            return
+
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta**2 * self.n * other.n / n
+        self.n = n
+
+    def copy(self):
+        stats = RunningStats(self.pointsPerValue)
+        stats.n, stats.mean, stats.m2 = self.n, self.mean, self.m2
+
+        return stats
+
+    @property
+    def variance(self):
+        '''
+            variance of the values (per sample)
+        '''
+
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def error(self):
+        '''
+            uncertainty of the mean
+        '''
+
+        return np.sqrt(self.variance / self.n) if self.n > 0 else 0.0
+
+    @property
+    def points(self):
+        '''
+            number of sample points
+        '''
+
+        return self.n * self.pointsPerValue
+
+    @property
+    def variancePerPoint(self):
+        '''
+            variance of the estimate times the number of points, the same as var(f) * volume^2 for uniform sampling
+        '''
+
+        return self.variance * self.pointsPerValue
+
+
+def limitArrays(dim, lim):
+    '''
+        lower and upper limits of the first dim dimensions as arrays, and the volume of the region they enclose
+    '''
+
+    lim = np.asarray(lim, dtype=np.float64).reshape(-1, 2)[:dim]
+    low, high = lim[:, 0], lim[:, 1]
+
+    return low, high, np.prod(high - low)
+
+
+def strataGrid(dim, maxCells=maxStrata):
+    '''
+        lower corners of the stratified cells in units of the cell size, strataPerAxis cells along as many of the first
+        dimensions as fit in maxCells
+        returns:
+            (cells, stratified dimensions) array of ints
+    '''
+
+    numAxes = 0
+    while numAxes < dim and strataPerAxis**(numAxes + 1) <= maxCells:
+        numAxes += 1
+
+    return np.indices((strataPerAxis,) * numAxes).reshape(numAxes, strataPerAxis**numAxes).T
+
+
+def uniformBlock(rng, func, dim, low, high, n, parameter):
+    '''
+        n estimates of the integral, volume * f(x) with x uniform in the region
+    '''
+
+    points = rng.uniform(low, high, (n, dim))
+
+    return np.prod(high - low) * func(points, dim)
+
+
+def stratifiedBlock(rng, func, dim, low, high, n, grid):
+    '''
+        n // len(grid) estimates of the integral, each the mean of volume * f(x) over one point in every cell of grid.
+        the cells only split the stratified coordinates, so only the part of the variance that comes from f changing
+        across the cells is removed, for the hypersphere (which depends on the radius) importance sampling is the
+        method that helps
+    '''
+
+    numCells, numAxes = grid.shape
+    rounds = max(1, n // numCells)
+
+    # the stratified dimensions get a uniform point inside their cell, the others are uniform over the whole range
+    unit = rng.random((rounds, numCells, dim))
+    unit[:, :, :numAxes] += grid
+    unit[:, :, :numAxes] /= strataPerAxis
+    points = (low + unit * (high - low)).reshape(-1, dim)
+
+    values = func(points, dim).reshape(rounds, numCells)
+
+    return np.prod(high - low) * values.mean(axis=1)
+
+
+def importanceBlock(rng, func, dim, low, high, n, exponent):
+    '''
+        n estimates of the integral, f(x) / p(x) with x drawn from p(x) = prod((a + 1) / 2 * (1 - |t|)^a) / volume,
+        where t goes from -1 to 1 across every dimension
+    '''
+
+    # 1 - |t| = u^(1 / (a + 1)) for u uniform in (0, 1], so (1 - |t|)^a = u^(a / (a + 1)) and the weight is found from
+    # log(u) without losing precision near the edges
+    u = 1.0 - rng.random((n, dim))
+    t = 1.0 - u**(1.0 / (exponent + 1.0))
+    t *= np.where(rng.random((n, dim)) < 0.5, -1.0, 1.0)
+    points = (low + high) / 2 + t * (high - low) / 2
+
+    logWeight = -dim * np.log(exponent + 1.0) - exponent / (exponent + 1.0) * np.log(u).sum(axis=1)
+
+    return np.prod(high - low) * np.exp(logWeight) * func(points, dim)
+
+
+def sweepBlock(rng, func, dim, low, high, n, parameter):
+    '''
+        n estimates of the integrals over the first 0, 1, ..., dim dimensions from the same uniform points, func
+        returns one column per number of dimensions and column d is multiplied by the volume of the first d dimensions
+    '''
+
+    points = rng.uniform(low, high, (n, dim))
+    volumes = np.concatenate([[1.0], np.cumprod(high - low)])
+
+    return volumes * func(points, dim)
+
+
+blockFunctions = {'uniform': uniformBlock, 'stratified': stratifiedBlock, 'importance': importanceBlock,
+                  'sweep': sweepBlock}
+
+
+def tuneExponent(func, dim, lim, seed, numPoints=blockSize):
+    '''
+        exponent of the importance sampling density with the smallest variance in a short pilot run. exponents that
+        don't give a single nonzero value are skipped, 0 (uniform) is used if none of them do
+    '''
+
+    rng = np.random.default_rng(seed)
+    low, high, volume = limitArrays(dim, lim)
+
+    best, bestVariance = 0.0, np.inf
+    for exponent in importanceExponents:
+        values = importanceBlock(rng, func, dim, low, high, numPoints, exponent)
+        if np.any(values != 0) and np.var(values) < bestVariance:
+            best, bestVariance = exponent, np.var(values)
+
+    return best
+
+
+def sampleStream(func, dim, lim, checkpoints, seed, blockSize=blockSize, method='uniform', parameter=None):
+    '''
+        evaluates the integrand at random points, a block of points at a time, and keeps a copy of the running stats
+        every time the number of points reaches a checkpoint
+        input:
+            func (function): integrand, takes a (points, dim) array of points and dim and returns an array of values
+            dim (int): number of dimensions
+            lim (2-d list of floats): lower and upper limit of integration of each dimension
+            checkpoints (list of ints): increasing numbers of sample points, the last one is the total number of
+                                        points. they're rounded down to whole rounds for stratified sampling
+            seed (int or np.random.SeedSequence): seed of this stream of random numbers
+            blockSize (int): number of points drawn at a time
+            method (string): 'uniform', 'stratified' or 'importance'
+            parameter: cell grid for stratified sampling, density exponent for importance sampling
+        returns:
+            list with the RunningStats of the estimates of the integral at every checkpoint
+    '''
+
+    rng = np.random.default_rng(seed)
+    low, high, volume = limitArrays(dim, lim)
+    blockFunction = blockFunctions[method]
+    stats = RunningStats(len(parameter) if method == 'stratified' else 1)
+
+    # stratified blocks hold whole rounds, and at least one round is sampled
+    pointsPerValue = stats.pointsPerValue
+    blockSize = max(blockSize // pointsPerValue, 1) * pointsPerValue
+    if method == 'stratified':
+        checkpoints = [max(N // pointsPerValue, 1) * pointsPerValue for N in checkpoints]
+
+    snapshots = []
+    position = 0
+    for stop in checkpoints:
+        while position < stop:
+            n = min(blockSize, stop - position)
+            stats.add(blockFunction(rng, func, dim, low, high, n, parameter))
+            position += n
+        snapshots.append(stats.copy())
+
+    return snapshots
+
+
+def sampleReplicas(func, dim, lim, checkpoints, seeds, blockSize=blockSize, method='sobol'):
+    '''
+        randomized quasi-Monte Carlo, every seed scrambles its own copy of the quasi-random sequence and the mean of
+        volume * f over the first points of the copy is one estimate of the integral
+        input:
+            func (function): integrand, takes a (points, dim) array of points and dim and returns an array of values
+            dim (int): number of dimensions
+            lim (2-d list of floats): lower and upper limit of integration of each dimension
+            checkpoints (list of ints): increasing numbers of points of every copy
+            seeds (list of np.random.SeedSequence): seed of the scramble of every copy
+            blockSize (int): number of points drawn at a time
+            method (string): 'sobol' or 'halton'
+        returns:
+            list with the RunningStats of the estimates of every copy at every checkpoint
+    '''
+
+    low, high, volume = limitArrays(dim, lim)
+    estimates = np.zeros((len(checkpoints), len(seeds)))
+
+    for replica, seed in enumerate(seeds):
+        sequence = quasiRandom.sequences[method](dim, np.random.default_rng(seed))
+        total = 0.0
+        position = 0
+        for i, stop in enumerate(checkpoints):
+            while position < stop:
+                n = min(blockSize, stop - position)
+                points = low + sequence.block(position, n) * (high - low)
+                total += np.sum(func(points, dim))
+                position += n
+            estimates[i, replica] = volume * total / max(stop, 1)
+
+    snapshots = []
+    for stop, values in zip(checkpoints, estimates):
+        stats = RunningStats(stop)
+        stats.add(values)
+        snapshots.append(stats)
+
+    return snapshots
+
+
+def canPickle(func):
+    '''
+        True if func can be sent to a worker process
+    '''
+
+    try:
+        pickle.dumps(func)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+
+    return True
+
+
+def integrateCheckpoints(func, dim, lim, checkpoints, seed=None, workers=1, blockSize=blockSize, method='uniform'):
+    '''
+        Monte Carlo integration with the result and its uncertainty after every checkpoint number of points, all from
+        one pass over the largest number of points, so the error as a function of N costs nothing extra
+        input:
+            func (function): integrand, takes a (points, dim) array of points and dim and returns an array of values
+            dim (int): number of dimensions
+            lim (2-d list of floats): lower and upper limit of integration of each dimension
+            checkpoints (list of ints): numbers of sample points to find the integral with, in any order
+            seed (int): seed of the random numbers, the same seed and number of workers give the same result
+            workers (int): number of worker processes, uses every core if None. the workers are forked and func is
+                           pickled to send it to them, so func has to be defined at the top level of a module
+                           (or be a functools.partial of one). every stream runs in this process when func can't
+                           be pickled (ie a lambda or a function defined inside another function) or where
+                           forking isn't available
+            blockSize (int): number of points drawn at a time
+            method (string): 'uniform', 'stratified', 'importance', 'sobol' or 'halton'
+        returns:
+            list with the value of the integral, its uncertainty, and the RunningStats of the estimates for every
+            checkpoint, in the same order as checkpoints
+    '''
+
+    if method not in blockFunctions and method not in quasiRandom.sequences:
+        raise ValueError('unknown Monte Carlo method %s, use one of %s' % (method, ', '.join(methods)))
+
+    # the points are sampled in one pass up to the largest checkpoint, so the checkpoints are sorted here and the
+    # results are put back in the order they were asked for at the end
+    requested = [int(N) for N in checkpoints]
+    checkpoints = sorted(set(requested))
+    N = checkpoints[-1]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, N // blockSize + 1))
+
+    root = np.random.SeedSequence(seed)
+    if method in quasiRandom.sequences:
+        # the scrambled copies are split between the workers, and every copy gets an equal share of the points
+        workers = min(workers, qmcReplicas)
+        replicaSeeds = root.spawn(qmcReplicas)
+        counts = [max(n // qmcReplicas, 1) for n in checkpoints]
+        tasks = [(sampleReplicas, func, dim, lim, counts, replicaSeeds[i::workers], blockSize, method)
+                 for i in range(workers)]
+    else:
+        # every worker gets its own independent stream of random numbers and an equal share of the points (also at
+        # every checkpoint), the pilot run of importance sampling has a stream of its own
+        seeds = root.spawn(workers)
+        pilotSeed = root.spawn(1)[0]
+
+        parameter = None
+        if method == 'stratified':
+            parameter = strataGrid(dim, min(maxStrata, checkpoints[0] // workers // minRounds))
+        elif method == 'importance':
+            parameter = tuneExponent(func, dim, lim, pilotSeed)
+
+        tasks = [(sampleStream, func, dim, lim, [n // workers + (1 if i < n % workers else 0) for n in checkpoints],
+                  seeds[i], blockSize, method, parameter) for i in range(workers)]
+
+    if workers == 1 or 'fork' not in multiprocessing.get_all_start_methods() or not canPickle(func):
+        results = [task[0](*task[1:]) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as pool:
+            futures = [pool.submit(*task) for task in tasks]
+            results = [future.result() for future in futures]
+
+    # the stats of every worker at the same checkpoint are merged
+    integrals = {}
+    for checkpoint, snapshots in zip(checkpoints, zip(*results)):
+        stats = RunningStats(snapshots[0].pointsPerValue)
+        for snapshot in snapshots:
+            stats.merge(snapshot)
+        integrals[checkpoint] = (stats.mean, stats.error, stats)
+
+    return [integrals[checkpoint] for checkpoint in requested]
+
+
+def integrate(func, dim, lim, N, seed=None, workers=1, blockSize=blockSize, method='uniform'):
+    '''
+        Monte Carlo integration, I = <estimate> with uncertainty sqrt(var(estimate) / number of estimates). for
+        uniform sampling every estimate is volume * f(x), so this is the mean-value method
+        input:
+            func (function): integrand, takes a (points, dim) array of points and dim and returns an array of values
+            dim (int): number of dimensions
+            lim (2-d list of floats): lower and upper limit of integration of each dimension
+            N (int): number of sample points
+            seed (int): seed of the random numbers, the same seed and number of workers give the same result
+            workers (int): number of worker processes, uses every core if None
+            blockSize (int): number of points drawn at a time
+            method (string): 'uniform', 'stratified', 'importance', 'sobol' or 'halton'
+        returns:
+            value of the integral, its uncertainty, and the RunningStats of the estimates
+    '''
+
+    return integrateCheckpoints(func, dim, lim, [N], seed, workers, blockSize, method)[0]
+
+
+def integrateSweep(func, maxDim, lim, N, seed=None, workers=1, blockSize=blockSize):
+    '''
+        Monte Carlo integration over the first 0, 1, ..., maxDim dimensions all from one set of uniform points, ie
+        the volumes of spheres of every dimension from the prefix sums of the squared coordinates
+        input:
+            func (function): integrand, takes a (points, maxDim) array of points and maxDim and returns a
+                             (points, maxDim + 1) array, column d with the integrand of the first d coordinates
+            maxDim (int): largest number of dimensions
+            lim (2-d list of floats): lower and upper limit of integration of each dimension
+            N (int): number of sample points
+            seed (int): seed of the random numbers
+            workers (int): number of worker processes, uses every core if None
+            blockSize (int): number of points drawn at a time
+        returns:
+            arrays with the value of the integral and its uncertainty for every number of dimensions, and the
+            RunningStats of the estimates
+    '''
+
+    return integrateCheckpoints(func, maxDim, lim, [N], seed, workers, blockSize, 'sweep')[0]
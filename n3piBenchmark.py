@@ -0,0 +1,223 @@
+#! /usr/bin/env python3
+
+'''
+n3piBenchmark.py is a python script that times every stage of the n3pi_analysis.py pipeline (parsing the text file,
+building and loading the cache, building the DataFrame, finding the invariant masses, filling the histograms and
+rendering the plots) for several numbers of events. the input files are made with genr8Generator.py with a fixed
+seed, so every run works on the same events. each number of events runs in its own process, so the peak memory
+(RSS) of one size doesn't carry over into the next. the peak memory kept for a stage is the peak of the process up
+to the end of that stage, so it includes every earlier stage of the same size. the results are written to a .json file
+that can be compared to the results of an older version
+
+usage:
+    python n3piBenchmark.py [-n 10000,100000,1000000] [-o n3pi_benchmark.json] [-c old_benchmark.json]
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import os
+import sys
+import json
+import time
+import platform
+import resource
+import tempfile
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import genr8Generator
+import genr8Reader
+import eventCache
+import fourVector
+import n3piEvents
+import histogram
+import histogramPlotting
+
+eventCounts = [10000, 100000, 1000000]      # default numbers of events to time the pipeline with
+seed = 4151                                 # seed of the generated input files
+
+
+def peakMemory():
+    '''
+        largest resident memory (RSS) of this process so far in MB
+    '''
+
+    # linux gives ru_maxrss in kB, macOS gives it in bytes
+    scale = 1.0 / 1024**2 if sys.platform == 'darwin' else 1.0 / 1024
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+class StageTimer:
+    '''
+        times stages one after another and keeps the time and events/second of each one, and the peak memory of
+        the process by the end of each one (ru_maxrss never goes down, so it is not the peak of the stage alone)
+    '''
+
+    def __init__(self, numEvents):
+        self.numEvents = numEvents
+        self.stages = {}
+
+    def run(self, name, func, *args):
+        '''
+            runs one stage and records how long it took
+            input:
+                name (string): name of the stage
+                func (function): the stage, called with args
+            returns:
+                whatever func returns
+        '''
+
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+
+        self.stages[name] = {'seconds': elapsed,
+                             'eventsPerSecond': self.numEvents / max(elapsed, 1e-9),
+                             'processPeakRSS_MB': peakMemory()}
+
+        return result
+
+
+def buildDataFrame(columns):
+    return pd.DataFrame({name: np.asarray(values) for name, values in columns.items()})
+
+
+def fillHistograms(masses, p4):
+    histograms = {name: histogram.Histogram1D(100, 0., 2.) for name in n3piEvents.combos}
+    for i, name in enumerate(n3piEvents.combos):
+        histograms[name].fill(masses[:, i])
+    histograms.update(n3piEvents.newDalitzHistograms())
+    n3piEvents.fillDalitz(histograms, p4)
+
+    return histograms
+
+
+def benchmarkPipeline(numEvents, workDir):
+    '''
+        runs the whole pipeline once on a generated file and times each stage
+        input:
+            numEvents (int): number of events
+            workDir (string): directory for the input file, cache and plots
+        returns:
+            dictionary of stage name to seconds, events/second and peak memory of the process so far
+    '''
+
+    fileName = os.path.join(workDir, 'n3pi_%d.dat' % numEvents)
+    timer = StageTimer(numEvents)
+
+    timer.run('generate', genr8Generator.writeGenr8, fileName, numEvents, 'n3pi', seed, None, 500000, False)
+    timer.run('parse', genr8Reader.readGenr8, fileName, 100000, False)
+    timer.run('cache build', eventCache.buildCache, fileName, eventCache.defaultCacheDir(fileName))
+    columns = timer.run('cache load', eventCache.loadEvents, fileName, None, None, None, False)
+    timer.run('dataframe', buildDataFrame, columns)
+    p4 = timer.run('four-vectors', n3piEvents.buildFourVectors, columns)
+    masses = timer.run('invariant masses', n3piEvents.comboMasses, p4)
+    histograms = timer.run('histogram fill', fillHistograms, masses, p4)
+
+    plots = [{'histogram': name, 'output': os.path.join(workDir, name + '.png'), 'title': name}
+             for name in histograms]
+    timer.run('plot render', histogramPlotting.renderPlots, plots, histograms)
+
+    return timer.stages
+
+
+def benchmarkInProcess(numEvents):
+    '''
+        benchmarkPipeline in a new process with its own temporary directory, so the peak memory only comes from
+        this number of events
+    '''
+
+    with tempfile.TemporaryDirectory() as workDir:
+        return benchmarkPipeline(numEvents, workDir)
+
+
+def versionInfo():
+    '''
+        describes the code and machine the benchmark ran on
+    '''
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ''
+
+    return {'commit': commit,
+            'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'system': platform.system(),
+            'cpus': os.cpu_count()}
+
+
+def runBenchmarks(counts=eventCounts):
+    '''
+        benchmarks the pipeline for every number of events, one process each. the processes come from a
+        ProcessPoolExecutor instead of a multiprocessing Pool, because Pool workers are daemons and can't start
+        processes of their own
+        returns:
+            dictionary with the version info and the stages of every number of events
+    '''
+
+    results = {'version': versionInfo(), 'runs': []}
+
+    context = multiprocessing.get_context('spawn')
+    for numEvents in counts:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            stages = pool.submit(benchmarkInProcess, numEvents).result()
+        results['runs'].append({'numEvents': numEvents, 'stages': stages})
+        printRun(numEvents, stages)
+
+    return results
+
+
+def printRun(numEvents, stages, reference=None):
+    '''
+        prints the stages of one run, and how much faster each stage is than in the reference run if given
+    '''
+
+    print('%d events' % numEvents)
+    print('    %-18s %10s %14s %17s %10s' % ('Stage', 'Time (s)', 'Events/s', 'Process peak (MB)', 'Speedup'))
+    for name, stage in stages.items():
+        speedup = ''
+        if reference is not None and name in reference:
+            speedup = '%.2fx' % (reference[name]['seconds'] / max(stage['seconds'], 1e-9))
+        # older results called the process peak peakRSS_MB
+        peak = stage.get('processPeakRSS_MB', stage.get('peakRSS_MB', float('nan')))
+        print('    %-18s %10.3f %14.0f %17.1f %10s' % (name, stage['seconds'], stage['eventsPerSecond'], peak, speedup))
+
+
+def compareResults(results, reference):
+    '''
+        prints every run next to the run with the same number of events in an older set of results
+    '''
+
+    print('Compared to commit %s (%s)' % (reference['version'].get('commit', '?'), reference['version']['date']))
+    referenceRuns = {run['numEvents']: run['stages'] for run in reference['runs']}
+    for run in results['runs']:
+        printRun(run['numEvents'], run['stages'], referenceRuns.get(run['numEvents']))
+
+
+# main code block
+if __name__ == '__main__':
+    counts = eventCounts
+    if '-n' in sys.argv:
+        counts = [int(float(value)) for value in sys.argv[sys.argv.index('-n') + 1].split(',')]
+    outputName = sys.argv[sys.argv.index('-o') + 1] if '-o' in sys.argv else 'n3pi_benchmark.json'
+
+    results = runBenchmarks(counts)
+
+    with open(outputName, 'w') as outf:
+        json.dump(results, outf, indent=1)
+    print('Wrote benchmark results to %s' % outputName)
+
+    if '-c' in sys.argv:
+        with open(sys.argv[sys.argv.index('-c') + 1]) as inf:
+            compareResults(results, json.load(inf))
@@ -0,0 +1,158 @@
+#! /usr/bin/env python3
+
+'''
+n3piEvents.py is a python module that holds what is specific to the reaction
+    g p -> n pi+ pi- pi+
+the particles in the genr8 file, the target proton at rest, the recoil neutron found from the missing momentum,
+the combinations of particles whose invariant masses get histogrammed, and the Dalitz plots of the three pions
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import numpy as np
+import fourVector
+import histogram
+import kinematicFit
+
+targetMass = 0.938      # mass of the target proton in GeV, it starts at rest
+
+# names of the particles in the genr8 file (see genr8Reader.particleLabels)
+finalState = ['photon', 'pip1', 'pim', 'pip2']
+
+# names of the measured pions
+pions = ['pip1', 'pim', 'pip2']
+
+# combinations of particles whose invariant masses are histogrammed, with a description of each one
+combos = {
+    'm_combo1': ['neutron', 'pip1', 'pip2', 'pim'],     # neutron, the 2 pi plus particles, and pi minus
+    'm_combo2': ['pip1', 'pip2', 'pim'],                # 2 pi plus particles and pi minus
+    'm_combo3': ['pip1', 'pim'],                        # 1st pi plus and pi minus
+    'm_combo4': ['pip2', 'pim'],                        # 2nd pi plus and pi minus
+    'm_combo5': ['pip1', 'pip2'],                       # 2 pi plus particles
+    'm_combo6': ['neutron', 'pip1'],                    # neutron and 1st pi plus
+    'm_combo7': ['neutron', 'pip2'],                    # neutron and 2nd pi plus
+    'm_combo8': ['neutron', 'pim'],                     # neutron and pi minus
+}
+
+titles = {
+    'm_combo1': r'Invariant 4-Momenta Mass of Neutron, $\pi^+_1$, $\pi^+_2$, and $\pi^-$ Combination',
+    'm_combo2': r'Invariant 4-Momenta Mass of $\pi^+_1$, $\pi^+_2$, and $\pi^-$ Combination',
+    'm_combo3': r'Invariant 4-Momenta Mass of $\pi^+_1$ and $\pi^-$ Combination',
+    'm_combo4': r'Invariant 4-Momenta Mass of $\pi^+_2$ and $\pi^-$ Combination',
+    'm_combo5': r'Invariant 4-Momenta Mass of $\pi^+_1$ and $\pi^+_2$ Combination',
+    'm_combo6': r'Invariant 4-Momenta Mass of Neutron and $\pi^+_1$ Combination',
+    'm_combo7': r'Invariant 4-Momenta Mass of Neutron and $\pi^+_2$ Combination',
+    'm_combo8': r'Invariant 4-Momenta Mass of Neutron and $\pi^-$ Combination',
+}
+
+# pairs of pions whose invariant masses squared go on the axes of the Dalitz plots
+pionPairs = {
+    'm2_pip1pim': ['pip1', 'pim'],
+    'm2_pip2pim': ['pip2', 'pim'],
+    'm2_pip1pip2': ['pip1', 'pip2'],
+}
+
+# what each pair turns into when the two identical pi+ are swapped
+swappedPairs = {'m2_pip1pim': 'm2_pip2pim', 'm2_pip2pim': 'm2_pip1pim', 'm2_pip1pip2': 'm2_pip1pip2'}
+
+# Dalitz plots, given as the pairs on the (x, y) axes
+dalitzPlots = {
+    'dalitz_pippim_pippim': ('m2_pip1pim', 'm2_pip2pim'),      # M^2(pi+1 pi-) v. M^2(pi+2 pi-)
+    'dalitz_pippim_pippip': ('m2_pip1pim', 'm2_pip1pip2'),     # M^2(pi+1 pi-) v. M^2(pi+1 pi+2)
+}
+
+dalitzBinning = (100, 0., 5., 100, 0., 5.)     # binning of both axes of the Dalitz plots in GeV^2
+
+
+def addTargetAndNeutron(p4):
+    '''
+        adds the target proton and the recoil neutron to the four-vectors, neither of them is in the genr8 file
+        input:
+            p4 (FourVectorArray): four-vectors of the particles in finalState
+    '''
+
+    p4.addParticle('proton', [0.0, 0.0, 0.0, targetMass])
+
+    # the neutron is the "missing" momentum, a minus sign in front of a name subtracts that particle
+    p4.addParticle('neutron', p4.combine([['photon', 'proton', '-pip1', '-pip2', '-pim']])[:, 0])
+
+
+def buildFourVectors(columns, dtype=np.float64):
+    '''
+        builds the four-vectors of every particle in the reaction
+        input:
+            columns (dictionary): column name to 1-d array of values, ie from genr8Reader.eventColumns
+            dtype (numpy data type): data type of the four-vectors, ie np.float32 for the compact schema
+        returns:
+            FourVectorArray of the particles in finalState plus the proton and neutron
+    '''
+
+    p4 = fourVector.FourVectorArray.fromColumns(columns, finalState, dtype)
+    addTargetAndNeutron(p4)
+
+    return p4
+
+
+def comboMasses(p4):
+    '''
+        calculates the invariant masses of every combination in combos
+        input:
+            p4 (FourVectorArray): four-vectors from buildFourVectors
+        returns:
+            2-d array of invariant masses with shape (events, combinations), in the order of combos
+    '''
+
+    return p4.invariantMasses(list(combos.values()))
+
+
+def fitNeutron(p4, resolution=0.02):
+    '''
+        kinematic fit of the pions in every event with the missing mass constrained to the neutron mass (see
+        kinematicFit.py)
+        input:
+            p4 (FourVectorArray): four-vectors from buildFourVectors
+            resolution (float): momentum resolution of the pions as a fraction of their momentum
+        returns:
+            FourVectorArray of the fitted pions and neutron, chi^2 of each event, and whether each fit converged
+    '''
+
+    measured = np.stack([p4[label] for label in pions], axis=1)
+    initial = p4['photon'] + p4['proton']
+
+    fittedPions, neutron, chi2, converged = kinematicFit.missingMassFit(
+        initial, measured, kinematicFit.momentumVariances(measured, resolution))
+
+    fitted = fourVector.FourVectorArray(np.concatenate([fittedPions, neutron[:, np.newaxis]], axis=1),
+                                        pions + ['neutron'])
+
+    return fitted, chi2, converged
+
+
+def newDalitzHistograms(binning=dalitzBinning):
+    '''
+        makes an empty 2-d histogram for every Dalitz plot in dalitzPlots
+    '''
+
+    return {name: histogram.Histogram2D(*binning) for name in dalitzPlots}
+
+
+def fillDalitz(histograms, p4, symmetrize=True):
+    '''
+        fills every Dalitz plot from one chunk of events, the masses squared of the pion pairs are only found once
+        and shared by all the plots
+        input:
+            histograms (dictionary): Dalitz plot name to Histogram2D, from newDalitzHistograms
+            p4 (FourVectorArray): four-vectors from buildFourVectors
+            symmetrize (bool): also fills every event with the two pi+ swapped, since there is no way to tell them
+                               apart
+    '''
+
+    massesSquared = p4.invariantMassesSquared(list(pionPairs.values()))
+    values = {name: massesSquared[:, i] for i, name in enumerate(pionPairs)}
+
+    for name, (x, y) in dalitzPlots.items():
+        histograms[name].fill(values[x], values[y])
+        if symmetrize:
+            histograms[name].fill(values[swappedPairs[x]], values[swappedPairs[y]])
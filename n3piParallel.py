@@ -0,0 +1,112 @@
+#! /usr/bin/env python3
+
+'''
+n3piParallel.py is a python script that runs the n3pi_analysis.py pipeline (parse, invariant masses, histograms)
+over many genr8 .dat files at once using a pool of worker processes. every worker streams its file in chunks and
+only sends back fixed-binning histograms (see histogram.py), which are added together at the end, so the memory
+used stays the same no matter how many events there are
+
+usage:
+    python n3piParallel.py file1.dat file2.dat ... [-j number_of_workers]
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import sys
+import time
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+import genr8Reader
+import n3piEvents
+import histogram
+
+massBinning = (100, 0., 2.)     # number of bins, low and high edge of the mass histograms in GeV (20 MeV bins)
+
+
+def newHistograms(binning=massBinning):
+    '''
+        makes an empty mass histogram for every combination in n3piEvents.combos, and an empty 2-d histogram for
+        every Dalitz plot in n3piEvents.dalitzPlots
+    '''
+
+    histograms = {name: histogram.Histogram1D(*binning) for name in n3piEvents.combos}
+    histograms.update(n3piEvents.newDalitzHistograms())
+
+    return histograms
+
+
+def fillFile(fileName, binning=massBinning, chunkSize=100000):
+    '''
+        histograms the invariant masses of every combination in n3piEvents.combos and fills the Dalitz plots for
+        one file
+        input:
+            fileName (string): name of genr8 .dat file
+            binning (tuple): number of bins, low and high edge of the histograms
+            chunkSize (int): number of events held in memory at a time
+        returns:
+            dictionary of histogram name to histogram, and the number of events in the file
+    '''
+
+    histograms = newHistograms(binning)
+    numEvents = 0
+
+    for events in genr8Reader.iterateEvents(fileName, chunkSize):
+        p4 = n3piEvents.buildFourVectors(genr8Reader.eventColumns(events))
+        masses = n3piEvents.comboMasses(p4)
+
+        for i, name in enumerate(n3piEvents.combos):
+            histograms[name].fill(masses[:, i])
+        n3piEvents.fillDalitz(histograms, p4)
+        numEvents += len(events)
+
+    return histograms, numEvents
+
+
+def fillFiles(fileNames, binning=massBinning, workers=None, chunkSize=100000):
+    '''
+        histograms many files in parallel, one file per task, and adds up the histograms of all of them
+        input:
+            fileNames (list of strings): names of genr8 .dat files
+            binning (tuple): number of bins, low and high edge of the histograms
+            workers (int): number of worker processes, uses every core if None
+            chunkSize (int): number of events each worker holds in memory at a time
+        returns:
+            dictionary of histogram name to histogram, and the total number of events
+    '''
+
+    total = newHistograms(binning)
+    numEvents = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(fillFile, fileNames, itertools.repeat(binning), itertools.repeat(chunkSize))
+
+        # the histograms are added up as each file finishes, so only one file's histograms are waiting at a time
+        for histograms, fileEvents in results:
+            for name in total:
+                total[name] += histograms[name]
+            numEvents += fileEvents
+
+    return total, numEvents
+
+
+# main code block
+if __name__ == '__main__':
+    fileNames = [arg for arg in sys.argv[1:] if arg.endswith('.dat')]
+    workers = None
+    if '-j' in sys.argv:
+        workers = int(sys.argv[sys.argv.index('-j') + 1])
+
+    outputName = 'n3pi_histograms.npz'
+
+    start = time.perf_counter()
+    histograms, numEvents = fillFiles(fileNames, massBinning, workers)
+    elapsed = time.perf_counter() - start
+
+    print('Histogrammed %d events from %d files in %.2f s (%.0f events/s)' % (numEvents, len(fileNames), elapsed,
+                                                                            numEvents / max(elapsed, 1e-9)))
+
+    # save the histograms so they can be plotted without running the analysis again
+    histogram.saveHistograms(outputName, histograms)
+    print('Saved histograms to %s' % outputName)
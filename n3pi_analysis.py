@@ -10,18 +10,25 @@ PHZ 4151C
 Apr 7, 2021
 '''
 
-# Example 1:  old style text file parsing
+# Example 1:  read the genr8 .dat file straight into numpy arrays (no csv conversion needed)
+import os
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+import eventCache
+import fourVector
+import n3piEvents
+import histogram
+import cutFlow
+import histogramPlotting
+import lorentzBoost
+import columnStore
+import yieldFit
+import acceptance
 
-# Convert data from genr8 .dat format to a csv format, for pandas
 input_file_name = "n3pi.dat"
-output_file_name = "n3pi.csv"
 
 # other variables
 num_events_to_print = 3
-num_events = 0     # keep track of of the number of events for debugging purposes
 
 ## format of one event
 ## 4   # number of particles
@@ -30,72 +37,25 @@ num_events = 0     # keep track of of the number of events for debugging purpose
 ## 9 -1 -7.765000e-02 7.233300e-02 1.372624e+00 1.383820e+00
 ## 8 1 5.548030e-01 -3.011580e-01 1.301439e+00 1.453219e+00
 
+# the file is parsed in large blocks of whole events (see genr8Reader.py) and stored the first time as a binary
+# cache with one .npy file per column next to the .dat file. later runs memory-map the cache instead of parsing
+# the text again, and the cache gets rebuilt by itself if the .dat file changes
+print("Reading %s ..."%(input_file_name))
+columns = eventCache.loadEvents(input_file_name)
 
-# open input and output files - the files will be automatically closed when we get out of the "with" statement
-print("Converting %s to %s ..."%(input_file_name,output_file_name))
-with open(input_file_name) as inf:
-    with open(output_file_name, "w") as outf:
-        # add header to define column names (output format) for pandas
-        header  = "photon_pid photon_charge photon_px photon_py photon_pz photon_pe"
-        header += " pip1_pid pip1_charge pip1_px pip1_py pip1_pz pip1_e"
-        header += " pip2_pid pip2_charge pip2_px pip2_py pip2_pz pip2_e"
-        header += " pim_pid pim_charge pim_px pim_py pim_pz pim_e"      # gotta add that newline
-        outf.write(header)
-        # dummy variables we use to save the information temporarily
-        photon = []
-        pip1 = []
-        pip2 = []
-        pim = []
-        # to parse the file, we use our knowledge that we're looking at a reaction
-        #  with 4 final state particles this part should be reworked for a different reaction
-        #  note that there's no error checking, which is a bad practice... if there's a problem,
-        #  hopefully an exception will be thrown...
-        for line in inf:
-            word = line.split()    # split line into a list of words (separated by whitespace)
-            value = int(word[0])   # look at the first value on a line to decide what to do
-
-            if value == 4:         # we're reading in 4 particles per event, so we know that each event starts with this
-                num_pi_plus = 0
-                # once we get to a new event, write the old one out
-                outstr = " ".join(photon) + " " + " ".join(pip1) + " " +  " ".join(pip2) + " " +  " ".join(pim)
-                if num_events <= num_events_to_print:
-                    print ("write out: %s"%outstr)
-                outf.write(outstr+'\n')
-                num_events += 1
-
-            elif value == 1:       # incoming beam photon
-                if num_events <= num_events_to_print:
-                    print("\tPhoton Beam with Energy: %f"%(float(word[5]) ) )
-                # lazily parse the particle into a simple list
-                photon = word[:6]    # finite bounds as a sanity check
-
-            elif value == 8:       # pi+ meson
-                if num_events <= num_events_to_print:
-                    print("\tPiPlus[%d] meson with Energy: %f"%(num_pi_plus, float(word[5])) )
-                num_pi_plus += 1
-                if num_pi_plus == 1:
-                    pip1 = word[:6]
-                else:
-                    pip2 = word[:6]
-
-            elif value == 9:       # pi- meson
-                if num_events <= num_events_to_print:
-                    print("\tPiMinus meson with Energy: %f"%(float(word[5])) )
-                pim = word[:6]
-
-        # assume there's one more event left over
-        outstr = " ".join(photon) + " " + " ".join(pip1) + " " +  " ".join(pip2) + " " +  " ".join(pim)
-        outf.write(outstr+'\n')
-
+# the particles are named using their IDs, the two pi+ get numbered in the order they show up (pip1, pip2)
+labels = [name[:-4] for name in columns if name.endswith('_pid')]
+for i in range(min(num_events_to_print, len(columns['photon_e']))):
+    print("Event %d:"%(i))
+    for label in labels:
+        print("\t%s with Energy: %f"%(label, columns[label + '_e'][i]))
 
 # print some summary info
+num_events = len(columns['photon_e'])
 print("Converted %d Events"%num_events)
 
-# how to read data in
-csv_data_file = "n3pi.csv"
-
-data = pd.read_csv(csv_data_file, delimiter = ' ')
-data.head()
+# build the four-vectors of the particles in the file, shape (events, particles, 4) with px py pz E
+p4 = fourVector.FourVectorArray.fromColumns(columns, labels)
 
 """
 # Example 2:  do more data manipulation in pandas
@@ -217,190 +177,187 @@ data.to_csv(output_file_name,index=False) # Do not store the column index
 data.head(10)
 """
 
+# add some invariant masses, each combination is a list of particle names and they are all found in one pass
+data = pd.DataFrame(p4.invariantMasses([['pip1'], ['pip1', 'pip2'], ['pip1', 'pim']]),
+                    columns=['mpi1', 'mpippip', 'mpip1pim'])
+
 # other examples
 # DataFrame.info() gives some summary info
 data.info()
 
-# add some columns to the tree corresponding to invariant masses
-def calc_invariant_mass(px, py, pz, e):
-    return np.sqrt( e**2 - px**2 - py**2 - pz**2 )
-
-data['mpi1'] = calc_invariant_mass(data['pip1_px'], data['pip1_py'], data['pip1_pz'], data['pip1_e'])
-data['mpippip'] = calc_invariant_mass(data['pip1_px']+data['pip2_px'], data['pip1_py']+data['pip2_py'], data['pip1_pz']+data['pip2_pz'], data['pip1_e']+data['pip2_e'])
-data['mpip1pim'] = calc_invariant_mass(data['pip1_px']+data['pim_px'], data['pip1_py']+data['pim_py'], data['pip1_pz']+data['pim_pz'], data['pip1_e']+data['pim_e'])
-
 # do the same for other masses
 data[ ['mpi1', 'mpippip', 'mpip1pim'] ].head(20)
 
-# make some plots
-ax = data["mpippip"].hist(bins=100)
-ax.set_xlim(0., 2.)
-ax.set_xlabel("M(pi1+pi2+) GeV")
-ax.set_ylabel("Counts / 20 MeV")
-plt.savefig('mpippip.png')
-
-plt.clf()
-# make some more plots
-ax = data["mpip1pim"].hist(bins=100)
-ax.set_xlim(0., 2.)
-ax.set_xlabel("M(pi1+pim) GeV")
-ax.set_ylabel("Counts / 20 MeV")
-plt.savefig('mpip1pim.png')
+# the masses are histogrammed with fixed bins, 0-2 GeV in 20 MeV bins, so the binning doesn't depend on the data
+def fill_histogram(values):
+    hist = histogram.Histogram1D(100, 0., 2.)
+    hist.fill(values)
+    return hist
+
+histograms = {}
+histograms["mpippip"] = fill_histogram(data["mpippip"].values)
+histograms["mpip1pim"] = fill_histogram(data["mpip1pim"].values)
+
+# describe the plots to make, they all get rendered together at the end (see histogramPlotting.py)
+plots = []
+plots.append({'histogram': 'mpippip', 'output': 'mpippip.png', 'xlim': (0., 2.),
+              'xlabel': "M(pi1+pi2+) GeV", 'ylabel': "Counts / 20 MeV"})
+plots.append({'histogram': 'mpip1pim', 'output': 'mpip1pim.png', 'xlim': (0., 2.),
+              'xlabel': "M(pi1+pim) GeV", 'ylabel': "Counts / 20 MeV"})
 
 # this is where I started adding code for the homework assignment
 
-# need to add columns to represent the target proton and recoil neutron into the data frame because they are not in the
-# original file, but we need the target information to calculate information about the neutron and it makes sense
-# to include all this information in the data frame, even if the info about the target might be redundant since it starts
-# at rest. will be in the same format as all the other particles with the exception of the particle id, because that is not
-# particularly relevant to us
-
-data['proton_charge'] = 1.0
-data['proton_px'] = 0.0
-data['proton_py'] = 0.0
-data['proton_pz'] = 0.0
-data['proton_e'] = 0.938
-data['m_proton'] = calc_invariant_mass(data['proton_px'], data['proton_py'], data['proton_pz'], data['proton_e'])
-
-# initialize all the neutron measurements by using finding the "missing" momentum
-data['neutron_charge'] = 0.0
-data['neutron_px'] = data['photon_px'] + data['proton_px'] - (data['pip1_px'] + data['pip2_px'] + data['pim_px'])
-data['neutron_py'] = data['photon_py'] + data['proton_py'] - (data['pip1_py'] + data['pip2_py'] + data['pim_py'])
-data['neutron_pz'] = data['photon_pz'] + data['proton_pz'] - (data['pip1_pz'] + data['pip2_pz'] + data['pim_pz'])
-data['neutron_e'] = data['photon_pe'] + data['proton_e'] - (data['pip1_e'] + data['pip2_e'] + data['pim_e'])
+# need to add the target proton and recoil neutron to the four-vectors because they are not in the original file,
+# but we need the target information to calculate information about the neutron. the target starts at rest, so
+# the same four-vector is used for every event
+
+# the neutron is the "missing" momentum, beam + target - pions (see n3piEvents.py)
+n3piEvents.addTargetAndNeutron(p4)
+data['m_proton'] = fourVector.invariantMass(p4['proton'])
 
 # calculate the invariant mass of the neutron
-data['m_neutron'] = calc_invariant_mass(data['neutron_px'], data['neutron_py'], data['neutron_pz'], data['neutron_e'])
+data['m_neutron'] = fourVector.invariantMass(p4['neutron'])
 
 # print the first 10 calculations of the neutron mass
 print('The invariant mass of the neutron for the first 10 events in GeV/c^2: ')
 print(data['m_neutron'].head(10))
 
-# find the invariant masses of the different combinations
-
-# neutron, the 2 pi plus particles, and pi minus
-data['combo1_px'] = data['neutron_px'] + data['pip1_px'] + data['pip2_px'] + data['pim_px']
-data['combo1_py'] = data['neutron_py'] + data['pip1_py'] + data['pip2_py'] + data['pim_py']
-data['combo1_pz'] = data['neutron_pz'] + data['pip1_pz'] + data['pip2_pz'] + data['pim_pz']
-data['combo1_e'] = data['neutron_e'] + data['pip1_e'] + data['pip2_e'] + data['pim_e']
-
-data['m_combo1'] = calc_invariant_mass(data['combo1_px'], data['combo1_py'], data['combo1_pz'], data['combo1_e'])
-
-#  2 pi plus particles and pi minus
-data['combo2_px'] = data['pip1_px'] + data['pip2_px'] + data['pim_px']
-data['combo2_py'] = data['pip1_py'] + data['pip2_py'] + data['pim_py']
-data['combo2_pz'] = data['pip1_pz'] + data['pip2_pz'] + data['pim_pz']
-data['combo2_e'] = data['pip1_e'] + data['pip2_e'] + data['pim_e']
-
-data['m_combo2'] = calc_invariant_mass(data['combo2_px'], data['combo2_py'], data['combo2_pz'], data['combo2_e'])
-
-# 1st pi plus and pi minus
-data['combo3_px'] = data['pip1_px'] + data['pim_px']
-data['combo3_py'] = data['pip1_py'] + data['pim_py']
-data['combo3_pz'] = data['pip1_pz'] + data['pim_pz']
-data['combo3_e'] = data['pip1_e'] + data['pim_e']
-
-data['m_combo3'] = calc_invariant_mass(data['combo3_px'], data['combo3_py'], data['combo3_pz'], data['combo3_e'])
-
-# 2nd pi plus and pi minus
-data['combo4_px'] = data['pip2_px'] + data['pim_px']
-data['combo4_py'] = data['pip2_py'] + data['pim_py']
-data['combo4_pz'] = data['pip2_pz'] + data['pim_pz']
-data['combo4_e'] = data['pip2_e'] + data['pim_e']
-
-data['m_combo4'] = calc_invariant_mass(data['combo4_px'], data['combo4_py'], data['combo4_pz'], data['combo4_e'])
-
-# 2 pi plus particles
-data['combo5_px'] = data['pip1_px'] + data['pip2_px']
-data['combo5_py'] = data['pip1_py'] + data['pip2_py']
-data['combo5_pz'] = data['pip1_pz'] + data['pip2_pz']
-data['combo5_e'] = data['pip1_e'] + data['pip2_e']
-
-data['m_combo5'] = calc_invariant_mass(data['combo5_px'], data['combo5_py'], data['combo5_pz'], data['combo5_e'])
-
-# neutron and 1st pi plus
-data['combo6_px'] = data['neutron_px'] + data['pip1_px']
-data['combo6_py'] = data['neutron_py'] + data['pip1_py']
-data['combo6_pz'] = data['neutron_pz'] + data['pip1_pz']
-data['combo6_e'] = data['neutron_e'] + data['pip1_e']
-
-data['m_combo6'] = calc_invariant_mass(data['combo6_px'], data['combo6_py'], data['combo6_pz'], data['combo6_e'])
-
-# neutron and 2nd pi plus
-data['combo7_px'] = data['neutron_px'] + data['pip2_px']
-data['combo7_py'] = data['neutron_py'] + data['pip2_py']
-data['combo7_pz'] = data['neutron_pz'] + data['pip2_pz']
-data['combo7_e'] = data['neutron_e'] + data['pip2_e']
-
-data['m_combo7'] = calc_invariant_mass(data['combo7_px'], data['combo7_py'], data['combo7_pz'], data['combo7_e'])
-
-# neutron and pi minus
-data['combo8_px'] = data['neutron_px'] + data['pim_px']
-data['combo8_py'] = data['neutron_py'] + data['pim_py']
-data['combo8_pz'] = data['neutron_pz'] + data['pim_pz']
-data['combo8_e'] = data['neutron_e'] + data['pim_e']
-
-data['m_combo8'] = calc_invariant_mass(data['combo8_px'], data['combo8_py'], data['combo8_pz'], data['combo8_e'])
-
-ax = data["m_combo1"].hist(bins=100)
-ax.set_xlim(0., 2.)
-ax.set_xlabel("Mass (GeV)")
-ax.set_ylabel("Counts / 20 MeV")
-plt.title(r'Invariant 4-Momenta Mass of Neutron, $\pi^+_1$, $\pi^+_2$, and $\pi^-$ Combination')
-plt.savefig('hist_combo1.png')
-
-plt.clf()
-ax = data["m_combo2"].hist(bins=100)
-ax.set_xlim(0., 2.)
-ax.set_xlabel("Mass (GeV)")
-ax.set_ylabel("Counts / 20 MeV")
-plt.title(r'Invariant 4-Momenta Mass of $\pi^+_1$, $\pi^+_2$, and $\pi^-$ Combination')
-plt.savefig('hist_combo2.png')
-
-plt.clf()
-ax = data["m_combo3"].hist(bins=100)
-ax.set_xlim(0., 2.)
-ax.set_xlabel("Mass (GeV)")
-ax.set_ylabel("Counts / 20 MeV")
-plt.title(r'Invariant 4-Momenta Mass of $\pi^+_1$ and $\pi^-$ Combination')
-plt.savefig('hist_combo3.png')
-
-plt.clf()
-ax = data["m_combo4"].hist(bins=100)
-ax.set_xlim(0., 2.)
-ax.set_xlabel("Mass (GeV)")
-ax.set_ylabel("Counts / 20 MeV")
-plt.title(r'Invariant 4-Momenta Mass of $\pi^+_2$ and $\pi^-$ Combination')
-plt.savefig('hist_combo4.png')
-
-plt.clf()
-ax = data["m_combo5"].hist(bins=100)
-ax.set_xlim(0., 2.)
-ax.set_xlabel("Mass (GeV)")
-ax.set_ylabel("Counts / 20 MeV")
-plt.title(r'Invariant 4-Momenta Mass of $\pi^+_1$ and $\pi^+_2$ Combination')
-plt.savefig('hist_combo5.png')
-
-plt.clf()
-ax = data["m_combo6"].hist(bins=100)
-ax.set_xlim(0., 2.)
-ax.set_xlabel("Mass (GeV)")
-ax.set_ylabel("Counts / 20 MeV")
-plt.title(r'Invariant 4-Momenta Mass of Neutron and $\pi^+_1$ Combination')
-plt.savefig('hist_combo6.png')
-
-plt.clf()
-ax = data["m_combo7"].hist(bins=100)
-ax.set_xlim(0., 2.)
-ax.set_xlabel("Mass (GeV)")
-ax.set_ylabel("Counts / 20 MeV")
-plt.title(r'Invariant 4-Momenta Mass of Neutron and $\pi^+_2$ Combination')
-plt.savefig('hist_combo7.png')
-
-plt.clf()
-ax = data["m_combo8"].hist(bins=100)
-ax.set_xlim(0., 2.)
-ax.set_xlabel("Mass (GeV)")
-ax.set_ylabel("Counts / 20 MeV")
-plt.title(r'Invariant 4-Momenta Mass of Neutron and $\pi^-$ Combination')
-plt.savefig('hist_combo8.png')
+# find the invariant masses of the different combinations in n3piEvents.combos, all of them at once without any
+# columns for the summed momentum components
+combo_masses = n3piEvents.comboMasses(p4)
+for i, name in enumerate(n3piEvents.combos):
+    data[name] = combo_masses[:, i]
+
+# the combination histograms are bootstrap histograms, 100 replicas are filled with Poisson weights in the same
+# pass over the events to get the statistical uncertainty of every bin (drawn as a band on the plots)
+bootstrap = histogram.PoissonBootstrap(100, seed=4151)
+for name in n3piEvents.combos:
+    histograms[name] = histogram.BootstrapHistogram1D(100, 0., 2., bootstrap.replicas)
+for start, stop, weights in bootstrap.blocks(num_events):
+    for i, name in enumerate(n3piEvents.combos):
+        histograms[name].fill(combo_masses[start:stop, i], weights)
+
+peak = np.argmax(histograms["m_combo3"].counts)
+print("Largest bin of m_combo3: %d +- %.1f counts (bootstrap), sqrt(N) = %.1f"%(
+      histograms["m_combo3"].counts[peak], histograms["m_combo3"].errors[peak],
+      np.sqrt(histograms["m_combo3"].counts[peak])))
+
+# Dalitz plots of the three pions, M^2(pi+1 pi-) v. M^2(pi+2 pi-) and M^2(pi+1 pi-) v. M^2(pi+1 pi+2). we can't
+# tell the two pi+ apart, so every event is also filled with them swapped
+histograms.update(n3piEvents.newDalitzHistograms())
+n3piEvents.fillDalitz(histograms, p4)
+
+# decay angles of the pi- in the 3 pion rest frame, in the Gottfried-Jackson and helicity frames. the boosts are
+# done a chunk of events at a time in one set of chunk-sized buffers that is reused for every chunk and both frames
+three_pions = p4.combine([['pip1', 'pim', 'pip2']])[:, 0]
+angle_chunk = 1 << 16
+boost_buffers = lorentzBoost.BoostBuffers(angle_chunk)
+for frame in ['gj', 'hel']:
+    angles = np.empty((2, len(three_pions)))
+    for start in range(0, len(three_pions), angle_chunk):
+        stop = min(start + angle_chunk, len(three_pions))
+        lorentzBoost.decayAngles(p4['photon'][start:stop], p4['neutron'][start:stop], three_pions[start:stop],
+                                 p4['pim'][start:stop], 'helicity' if frame == 'hel' else 'gj',
+                                 boost_buffers, angles[:, start:stop])
+    histograms["cos_theta_" + frame] = histogram.Histogram1D(100, -1., 1.)
+    histograms["cos_theta_" + frame].fill(angles[0])
+    histograms["phi_" + frame] = histogram.Histogram1D(100, -np.pi, np.pi)
+    histograms["phi_" + frame].fill(angles[1])
+    data["cos_theta_" + frame] = angles[0]
+    data["phi_" + frame] = angles[1]
+
+# correct the combination masses for the acceptance if there is an acceptance map (made from Monte Carlo, binned in
+# any of the columns of data, see acceptance.py). every event is weighted by 1 / acceptance, and the weighted
+# histograms keep the sum of the weights squared for their uncertainties
+acceptance_file_name = "n3pi_acceptance.npz"
+if os.path.exists(acceptance_file_name):
+    acceptance_map = acceptance.AcceptanceMap.load(acceptance_file_name)
+    event_weights = acceptance_map.weights(data)
+    print("Acceptance correction in %s, mean weight %.3f"%(", ".join(acceptance_map.names), np.mean(event_weights)))
+    for i, name in enumerate(n3piEvents.combos):
+        histograms[name + "_corrected"] = histogram.WeightedHistogram1D(100, 0., 2.)
+        histograms[name + "_corrected"].fill(combo_masses[:, i], event_weights)
+
+# the missing neutron has poor resolution, so the pions are kinematically fit with the missing mass constrained to
+# the neutron mass. all the events are fit at once, and the combinations are found again from the fitted momenta
+fitted, chi2, converged = n3piEvents.fitNeutron(p4)
+print("Kinematic fit converged for %d of %d events, mean chi^2 = %.3f"%(np.count_nonzero(converged), num_events,
+                                                                       np.nanmean(chi2[converged])))
+data['chi2'] = chi2
+histograms["chi2"] = histogram.Histogram1D(100, 0., 20.)
+histograms["chi2"].fill(chi2)
+
+fitted_masses = fitted.invariantMasses(list(n3piEvents.combos.values()))
+for i, name in enumerate(n3piEvents.combos):
+    histograms[name + "_fit"] = fill_histogram(fitted_masses[:, i])
+
+# select events with cuts, every cut is evaluated once as a mask and the masks are combined instead of making
+# copies of the data. the missing mass has to be close to the neutron mass, and the pi+1 pi- mass has to be in
+# the rho(770) band
+cuts = cutFlow.CutFlow()
+cuts.addWindow('missing neutron', 'm_neutron', 0.838, 1.038)
+cuts.addWindow('rho(770) band', 'm_combo3', 0.62, 0.92)
+selected = cuts.apply(data)
+cuts.printTable()
+
+histograms["m_combo3_neutron"] = fill_histogram(data["m_combo3"].values[cuts.combined(['missing neutron'])])
+histograms["m_combo2_selected"] = fill_histogram(data["m_combo2"].values[selected])
+
+# the compact schema (float32 momenta, int8 IDs and charges, no columns that are the same for every event) uses
+# much less memory. print how many combination masses land in a different bin than with float64, test_eventCache.py
+# checks that every entry that moves was within float32 rounding of a bin edge
+compact_columns = eventCache.loadEvents(input_file_name, compact=True)
+compact_masses = n3piEvents.comboMasses(n3piEvents.buildFourVectors(compact_columns, np.float32))
+
+def table_bytes(table):
+    # a constant column is a broadcast of one value (stride 0), it takes no memory
+    return sum(values.nbytes for values in table.values() if values.strides != (0,))
+
+print("Event table: %.1f MB as float64, %.1f MB compact"%(table_bytes(columns) / 1e6,
+                                                         table_bytes(compact_columns) / 1e6))
+max_difference = np.nanmax(np.abs(compact_masses - combo_masses))
+moved = 0
+for i, name in enumerate(n3piEvents.combos):
+    moved += np.sum(np.abs(fill_histogram(compact_masses[:, i]).bins - histograms[name].bins)) // 2
+print("Compact masses differ by at most %.2g GeV (bin width 0.02 GeV), %d of %d entries changed bins"%(
+      max_difference, moved, num_events * len(n3piEvents.combos)))
+
+# rho(770) yields in slices of the 3 pion mass, both pi+ pi- combinations go into the same slices. every slice is
+# fit to a Breit-Wigner plus a quadratic background at once, and the yields are also found by sideband subtraction
+histograms["m_combo3_v_m_combo2"] = histogram.Histogram2D(20, 0.5, 2.5, 100, 0., 2.)
+histograms["m_combo3_v_m_combo2"].fill(np.concatenate([data["m_combo2"].values, data["m_combo2"].values]),
+                                       np.concatenate([data["m_combo3"].values, data["m_combo4"].values]))
+rho_yields = yieldFit.yieldTable(histograms["m_combo3_v_m_combo2"])
+yieldFit.printYieldTable(rho_yields)
+columnStore.saveColumns('n3pi_rho_yields.parquet', rho_yields)
+
+# save the histograms so they can be looked at again without redoing the analysis
+histogram.saveHistograms('n3pi_histograms.npz', histograms)
+
+# save the particles and every derived column to one compressed columnar file (Parquet, or .npz without pyarrow),
+# later studies can load only the columns they need, ie columnStore.loadColumns(name, ['m_combo3', 'chi2'])
+results = dict(columns)
+results.update(data)
+results_file_name = columnStore.saveColumns('n3pi_results.parquet', results)
+print("Saved %d columns to %s"%(len(results), results_file_name))
+
+# every 2-, 3- and 4-body combination of the particles can also be found at once, the sums of the smaller
+# combinations get reused to build the bigger ones
+subsets, subset_masses = p4.subsetMasses([2, 3, 4])
+print("Found the invariant masses of %d combinations of %s"%(len(subsets), ", ".join(p4.labels)))
+
+# make the plots of the combinations and the Dalitz plot, rendered in parallel without pyplot
+for i, name in enumerate(n3piEvents.combos):
+    plots.append({'histogram': name, 'output': 'hist_combo%d.png'%(i + 1), 'xlim': (0., 2.),
+                  'xlabel': "Mass (GeV)", 'ylabel': "Counts / 20 MeV", 'title': n3piEvents.titles[name]})
+
+plots.append({'histogram': 'dalitz_pippim_pippim', 'output': 'dalitz_pippim_pippim.png',
+              'xlabel': r"$M^2(\pi^+_1 \pi^-)$ (GeV$^2$)", 'ylabel': r"$M^2(\pi^+_2 \pi^-)$ (GeV$^2$)",
+              'title': r'Dalitz Plot of $\pi^+ \pi^- \pi^+$, Symmetrized in the Two $\pi^+$'})
+
+plots.append({'histogram': 'cos_theta_gj', 'output': 'cos_theta_gj.png', 'xlim': (-1., 1.),
+              'xlabel': r"$\cos\theta_{GJ}$ of the $\pi^-$", 'ylabel': "Counts / 0.02"})
+plots.append({'histogram': 'phi_gj', 'output': 'phi_gj.png', 'xlim': (-np.pi, np.pi),
+              'xlabel': r"$\phi_{GJ}$ of the $\pi^-$ (rad)", 'ylabel': "Counts"})
+
+histogramPlotting.renderPlots(plots, histograms)
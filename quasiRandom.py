@@ -0,0 +1,216 @@
+#! /usr/bin/env python3
+
+'''
+quasiRandom.py is a python module with low-discrepancy (quasi-random) sequences for quasi-Monte Carlo integration, the
+Sobol sequence and the Halton sequence. the points fill the unit cube much more evenly than random points, so the
+error of a smooth integral falls close to 1/N instead of 1/sqrt(N). any block of points of a sequence is found all at
+once from the binary (Sobol) or base-b (Halton) digits of the point indices, so the sequences are drawn a block at a
+time like random numbers.
+
+both sequences can be randomized: the Sobol sequence with a random linear matrix scramble and digital shift, the
+Halton sequence with a random permutation of the digits at every digit position. every randomized copy of a sequence
+is still evenly spread, and its estimate of an integral is unbiased, so the spread of the estimates from a few
+independently scrambled copies gives the error (randomized quasi-Monte Carlo, see monteCarlo.py)
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import numpy as np
+
+numBits = 32        # bits of every Sobol coordinate, the sequence has 2^32 points
+
+# primitive polynomials and initial direction numbers of the Sobol sequence from dimension 2 on (S. Joe and F. Y. Kuo,
+# new-joe-kuo-6.21201), each is (degree s, coefficients a, first s direction numbers m)
+sobolTable = (
+    (1, 0, (1,)), (2, 1, (1, 3)), (3, 1, (1, 3, 1)), (3, 2, (1, 1, 1)), (4, 1, (1, 1, 3, 3)), (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)), (5, 4, (1, 1, 5, 5, 5)), (5, 7, (1, 1, 7, 11, 19)), (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)), (5, 14, (1, 3, 5, 5, 31)), (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)), (6, 16, (1, 3, 1, 13, 27, 49)), (6, 19, (1, 1, 1, 15, 7, 5)),
+    (6, 22, (1, 3, 1, 15, 13, 25)), (6, 25, (1, 1, 5, 5, 19, 61)), (7, 1, (1, 3, 7, 11, 23, 15, 103)),
+    (7, 4, (1, 3, 7, 13, 13, 15, 69)), (7, 7, (1, 1, 3, 13, 7, 35, 63)), (7, 8, (1, 3, 5, 9, 1, 25, 53)),
+    (7, 14, (1, 3, 1, 13, 9, 35, 107)), (7, 19, (1, 3, 1, 5, 27, 61, 31)), (7, 21, (1, 1, 5, 11, 19, 41, 61)),
+    (7, 28, (1, 3, 5, 3, 3, 13, 69)), (7, 31, (1, 1, 7, 13, 1, 19, 1)), (7, 32, (1, 3, 7, 5, 13, 19, 59)),
+    (7, 37, (1, 1, 3, 9, 25, 29, 41)), (7, 41, (1, 3, 5, 13, 23, 1, 55)), (7, 42, (1, 3, 7, 3, 13, 59, 17)),
+    (7, 50, (1, 3, 1, 3, 5, 53, 69)), (7, 55, (1, 1, 5, 5, 23, 33, 13)), (7, 56, (1, 1, 7, 7, 1, 61, 123)),
+    (7, 59, (1, 1, 7, 9, 13, 61, 49)), (7, 62, (1, 3, 3, 5, 3, 55, 33)), (8, 14, (1, 3, 1, 15, 31, 13, 49, 245)),
+    (8, 21, (1, 3, 5, 15, 31, 59, 63, 97)), (8, 22, (1, 3, 1, 11, 11, 11, 77, 249)),
+    (8, 38, (1, 3, 1, 11, 27, 43, 71, 9)), (8, 47, (1, 1, 7, 15, 21, 11, 81, 45)),
+    (8, 49, (1, 3, 7, 3, 25, 31, 65, 79)), (8, 50, (1, 3, 1, 1, 19, 11, 3, 205)),
+    (8, 52, (1, 1, 5, 9, 19, 21, 29, 157)), (8, 56, (1, 3, 7, 11, 1, 33, 89, 185)),
+    (8, 67, (1, 3, 3, 3, 15, 9, 79, 71)), (8, 70, (1, 3, 7, 11, 15, 39, 119, 27)),
+    (8, 84, (1, 1, 3, 1, 11, 31, 97, 225)), (8, 97, (1, 1, 1, 3, 23, 43, 57, 177)),
+    (8, 103, (1, 3, 7, 7, 17, 17, 37, 71)), (8, 115, (1, 3, 1, 5, 27, 63, 123, 213)),
+    (8, 122, (1, 1, 3, 5, 11, 43, 53, 133)), (9, 8, (1, 3, 5, 5, 29, 17, 47, 173, 479)),
+    (9, 13, (1, 3, 3, 11, 3, 1, 109, 9, 69)), (9, 16, (1, 1, 1, 5, 17, 39, 23, 5, 343)),
+    (9, 22, (1, 3, 1, 5, 25, 15, 31, 103, 499)), (9, 25, (1, 1, 1, 11, 11, 17, 63, 105, 183)),
+    (9, 44, (1, 1, 5, 11, 9, 29, 97, 231, 363)), (9, 47, (1, 1, 5, 15, 19, 45, 41, 7, 383)),
+    (9, 52, (1, 3, 7, 7, 31, 19, 83, 137, 221)), (9, 55, (1, 1, 1, 3, 23, 15, 111, 223, 83)),
+    (9, 59, (1, 1, 5, 13, 31, 15, 55, 25, 161)), (9, 62, (1, 1, 3, 13, 25, 47, 39, 87, 257)))
+
+maxSobolDimension = len(sobolTable) + 1
+
+
+def directionNumbers(dim):
+    '''
+        direction numbers of the first dim dimensions of the Sobol sequence
+        returns:
+            (dim, numBits) array of uint32, the binary fractions v_k * 2^32
+    '''
+
+    if dim > maxSobolDimension:
+        raise ValueError('the Sobol sequence is only available up to %d dimensions' % maxSobolDimension)
+
+    directions = np.zeros((dim, numBits), dtype=np.uint64)
+    if dim > 0:
+        directions[0] = 1 << np.arange(numBits - 1, -1, -1, dtype=np.uint64)
+
+    for j in range(1, dim):
+        s, a, m = sobolTable[j - 1]
+        v = [m[k] << (numBits - 1 - k) for k in range(min(s, numBits))]
+        for k in range(s, numBits):
+            value = v[k - s] ^ (v[k - s] >> s)
+            for i in range(1, s):
+                if (a >> (s - 1 - i)) & 1:
+                    value ^= v[k - i]
+            v.append(value)
+        directions[j] = v
+
+    return directions.astype(np.uint32)
+
+
+def linearScramble(directions, rng):
+    '''
+        multiplies the direction numbers of every dimension by a random lower triangular binary matrix with ones on
+        the diagonal (over GF(2), with the most significant bit first), which keeps the digital net property
+    '''
+
+    dim = len(directions)
+    bits = np.arange(numBits - 1, -1, -1, dtype=np.uint32)
+
+    # row k of every matrix has a 1 in column k and random bits in the columns before it
+    rows = rng.integers(0, 2, (dim, numBits, numBits), dtype=np.uint32)
+    rows = np.tril(rows, -1) + np.eye(numBits, dtype=np.uint32)
+    rowMasks = np.sum(rows << bits, axis=2, dtype=np.uint32)
+
+    # bit k of every scrambled direction number is the parity of row k and the direction number
+    parity = np.bitwise_count(rowMasks[:, None, :] & directions[:, :, None]) & 1
+
+    return np.sum(parity.astype(np.uint32) << bits, axis=2, dtype=np.uint32)
+
+
+class SobolSequence:
+    '''
+        Sobol sequence in Gray code order, scrambled if given a random number generator
+        dim (int): number of dimensions
+        rng (np.random.Generator): random numbers for the scramble, not scrambled if None
+    '''
+
+    def __init__(self, dim, rng=None):
+        self.dim = dim
+        self.directions = directionNumbers(dim)
+        self.shift = np.zeros(dim, dtype=np.uint32)
+
+        if rng is not None:
+            self.directions = linearScramble(self.directions, rng)
+            self.shift = rng.integers(0, 1 << numBits, dim, dtype=np.uint32)
+
+    def block(self, start, n):
+        '''
+            points start to start + n - 1 of the sequence
+            returns:
+                (n, dim) array of floats in [0, 1)
+        '''
+
+        if n == 0:
+            return np.zeros((0, self.dim))
+
+        # the first point is the XOR of the direction numbers of the set bits of the Gray code of its index, and every
+        # next point flips the direction number of the lowest zero bit of the index before it
+        gray = start ^ (start >> 1)
+        first = self.shift.copy()
+        for bit in range(gray.bit_length()):
+            if (gray >> bit) & 1:
+                first ^= self.directions[:, bit]
+
+        index = np.arange(start + 1, start + n, dtype=np.int64)
+        lowestBit = np.bitwise_count((index & -index) - 1)
+
+        values = np.empty((n, self.dim), dtype=np.uint32)
+        values[0] = first
+        values[1:] = self.directions.T[lowestBit]
+        np.bitwise_xor.accumulate(values, axis=0, out=values)
+
+        return values * 2.0**-numBits
+
+
+def primes(count):
+    '''
+        first count prime numbers
+    '''
+
+    found = []
+    candidate = 2
+    while len(found) < count:
+        if all(candidate % p != 0 for p in found if p * p <= candidate):
+            found.append(candidate)
+        candidate += 1
+
+    return found
+
+
+class HaltonSequence:
+    '''
+        Halton sequence, the radical inverse of the point index in the prime base of every dimension. if given a
+        random number generator every digit position of every dimension gets its own random permutation of the digits
+        dim (int): number of dimensions
+        rng (np.random.Generator): random numbers for the permutations, not scrambled if None
+    '''
+
+    def __init__(self, dim, rng=None):
+        self.dim = dim
+        self.bases = primes(dim)
+        self.permutations = []
+        self.tails = []
+
+        for base in self.bases:
+            # enough digits to reach double precision
+            numDigits = int(np.ceil(53 * np.log(2) / np.log(base)))
+            digits = np.tile(np.arange(base), (numDigits, 1))
+            if rng is not None:
+                digits = rng.permuted(digits, axis=1)
+            self.permutations.append(digits)
+
+            # digit positions past the last digit of the index are 0, and only add the value of their permuted 0
+            scales = float(base)**-np.arange(1, numDigits + 1)
+            tail = np.cumsum((digits[:, 0] * scales)[::-1])[::-1]
+            self.tails.append(np.append(tail, 0.0))
+
+    def block(self, start, n):
+        '''
+            points start to start + n - 1 of the sequence
+            returns:
+                (n, dim) array of floats in [0, 1)
+        '''
+
+        points = np.empty((n, self.dim))
+        last = start + n - 1
+
+        for j, base in enumerate(self.bases):
+            digits = self.permutations[j]
+            numDigits = min(len(digits), 1 + int(np.log(max(last, 1)) / np.log(base)) + 1)
+
+            index = np.arange(start, start + n, dtype=np.int64)
+            value = np.full(n, self.tails[j][numDigits])
+            scale = 1.0 / base
+            for position in range(numDigits):
+                index, digit = np.divmod(index, base)
+                value += digits[position][digit] * scale
+                scale /= base
+            points[:, j] = value
+
+        return points
+
+
+sequences = {'sobol': SobolSequence, 'halton': HaltonSequence}
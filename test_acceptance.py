@@ -0,0 +1,32 @@
+#! /usr/bin/env python3
+
+'''
+test_acceptance.py has pytest tests of the acceptance map lookups of acceptance.py
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import numpy as np
+import acceptance
+
+
+def test_axis_index_matches_digitize():
+    rng = np.random.default_rng(0)
+    edges = np.linspace(0.0, 2.0, 11)
+    values = np.concatenate([[np.nan, np.inf, -np.inf], edges, np.nextafter(edges, 9), np.nextafter(edges, -9),
+                             rng.uniform(-1.0, 3.0, 1000)])
+
+    uniform = acceptance.AcceptanceMap(['m'], [edges], np.ones(10))
+    assert uniform.uniform[0]
+    np.testing.assert_array_equal(uniform.axisIndex(0, values), np.digitize(values, edges) - 1)
+
+
+def test_nan_is_outside_the_map():
+    edges = np.linspace(0.0, 2.0, 11)
+    values = {'m': np.array([np.nan, 0.5])}
+
+    for axisEdges in (edges, np.concatenate([[0.0, 0.1], edges[2:]])):
+        acceptanceMap = acceptance.AcceptanceMap(['m'], [axisEdges], np.full(len(axisEdges) - 1, 0.5))
+        np.testing.assert_array_equal(acceptanceMap.weights(values), [0.0, 2.0])
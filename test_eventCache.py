@@ -0,0 +1,79 @@
+#! /usr/bin/env python3
+
+'''
+test_eventCache.py has pytest tests of the memory-mapped event cache of eventCache.py
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import os
+import numpy as np
+import eventCache
+import genr8Generator
+import genr8Reader
+import histogram
+import n3piEvents
+
+
+def test_cache_ignores_extra_lines(tmp_path):
+    fileName = str(tmp_path / 'events.dat')
+    genr8Generator.writeGenr8(fileName, 50, seed=1, verbose=False)
+    with open(fileName, 'a') as outf:
+        outf.write('\n' * 20)
+
+    cacheDir = str(tmp_path / 'cache')
+    header = eventCache.buildCache(fileName, cacheDir)
+    reference = genr8Reader.readRagged(fileName, verbose=False).columns()
+
+    assert header['numEvents'] == 50
+    assert header['columns'] == list(reference)
+    for name in reference:
+        stored = np.load(os.path.join(cacheDir, name + '.npy'))
+        assert len(stored) == 50
+        np.testing.assert_array_equal(stored, reference[name])
+
+
+def test_cache_ragged_events(tmp_path):
+    fileName = str(tmp_path / 'ragged.dat')
+    with open(fileName, 'w') as outf:
+        outf.write('4\n1 0 0 0 5 5\n8 1 0.1 0.2 1.9 2.0\n9 -1 0.3 -0.1 1.4 1.5\n8 1 -0.2 0.1 1.2 1.3\n')
+        for i in range(4):
+            outf.write('2\n1 0 0 0 5 5\n9 -1 0.%d 0.1 1.0 1.1\n' % i)
+        # a kind of particle that first shows up in the last event
+        outf.write('2\n1 0 0 0 5 5\n14 1 0.1 0.1 0.2 1.0\n')
+
+    cacheDir = str(tmp_path / 'cache')
+    header = eventCache.buildCache(fileName, cacheDir, chunkSize=2)
+    reference = genr8Reader.readRagged(fileName, verbose=False).columns()
+
+    assert header['numEvents'] == 6
+    assert header['columns'] == list(reference)
+    assert 'proton_e' in reference
+    for name in reference:
+        stored = np.load(os.path.join(cacheDir, name + '.npy'))
+        np.testing.assert_array_equal(stored, reference[name])
+
+
+def test_compact_masses_change_bins_only_at_edges(tmp_path):
+    fileName = str(tmp_path / 'n3pi.dat')
+    genr8Generator.writeGenr8(fileName, 20000, seed=4151, verbose=False)
+
+    full = n3piEvents.buildFourVectors(eventCache.loadEvents(fileName, verbose=False))
+    compact = n3piEvents.buildFourVectors(eventCache.loadEvents(fileName, verbose=False, compact=True), np.float32)
+    masses = n3piEvents.comboMasses(full)
+    compactMasses = n3piEvents.comboMasses(compact)
+
+    # float32 rounding of the momenta and of E^2 - p^2 moves a mass by about eps E^2 / m
+    energies = full.combine(list(n3piEvents.combos.values()))[..., 3]
+    tolerance = 16 * np.finfo(np.float32).eps * energies**2 / masses
+    finite = np.isfinite(masses)
+    assert np.all(np.abs(compactMasses - masses)[finite] <= tolerance[finite])
+
+    # the analysis histograms the masses with 100 bins from 0 to 2 GeV, an entry that lands in a different bin has
+    # to be within rounding of a bin edge
+    hist = histogram.Histogram1D(100, 0., 2.)
+    moved = finite & (hist.binIndex(compactMasses) != hist.binIndex(masses))
+    distance = np.min(np.abs(masses[moved][:, np.newaxis] - hist.edges), axis=1, initial=np.inf)
+    assert np.all(distance <= tolerance[moved])
@@ -0,0 +1,29 @@
+#! /usr/bin/env python3
+
+'''
+test_fourVector.py has pytest tests of the combination masses of fourVector.py
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import numpy as np
+import fourVector
+
+
+def randomArray(numEvents=50, labels=('a', 'b', 'c', 'd')):
+    rng = np.random.default_rng(3)
+    p4 = np.empty((numEvents, len(labels), 4))
+    p4[..., :3] = rng.normal(size=(numEvents, len(labels), 3))
+    p4[..., 3] = np.sqrt(np.sum(p4[..., :3]**2, axis=-1) + 0.14**2)
+
+    return fourVector.FourVectorArray(p4, labels)
+
+
+def test_subset_masses_any_size_order():
+    array = randomArray()
+    for sizes in ([2, 3], [3, 2], [3, 2, 3]):
+        subsets, masses = array.subsetMasses(sizes)
+        assert [len(subset) for subset in subsets] == sorted(len(subset) for subset in subsets)
+        np.testing.assert_allclose(masses, array.invariantMasses(subsets))
@@ -0,0 +1,46 @@
+#! /usr/bin/env python3
+
+'''
+test_genr8Reader.py has pytest tests of the genr8 .dat reader of genr8Reader.py
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import pytest
+import genr8Reader
+
+event = '2\n1 0 0.0 0.0 5.0 5.0\n8 1 0.1 0.2 1.9 2.0\n'
+
+
+def test_empty_file(tmp_path):
+    fileName = str(tmp_path / 'empty.dat')
+    open(fileName, 'w').close()
+
+    with pytest.raises(ValueError):
+        genr8Reader.readGenr8(fileName, verbose=False)
+    with pytest.raises(ValueError):
+        genr8Reader.readRagged(fileName, verbose=False)
+    with pytest.raises(ValueError):
+        genr8Reader.countParticles(fileName)
+
+
+def test_malformed_value(tmp_path):
+    fileName = str(tmp_path / 'events.dat')
+    with open(fileName, 'w') as outf:
+        outf.write(event + event.replace('0.2', '0.2x') + event)
+
+    with pytest.raises(ValueError):
+        genr8Reader.readGenr8(fileName, verbose=False)
+
+
+def test_regular_events(tmp_path):
+    fileName = str(tmp_path / 'events.dat')
+    with open(fileName, 'w') as outf:
+        outf.write(event * 3)
+
+    events = genr8Reader.readGenr8(fileName, verbose=False)
+
+    assert events.shape == (3, 2, 6)
+    assert events[2, 1, 5] == 2.0
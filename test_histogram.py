@@ -0,0 +1,39 @@
+#! /usr/bin/env python3
+
+'''
+test_histogram.py has pytest tests of the histogram accumulators of histogram.py
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import numpy as np
+import pytest
+import histogram
+
+
+def test_weighted_plus_unweighted():
+    weighted = histogram.WeightedHistogram1D(10, 0.0, 1.0)
+    weighted.fill([0.15, 0.25], [2.0, 3.0])
+    plain = histogram.Histogram1D(10, 0.0, 1.0)
+    plain.fill([0.15, 0.15, 0.55])
+
+    weighted += plain
+
+    np.testing.assert_allclose(weighted.counts[:6], [0, 4, 3, 0, 0, 1])
+    np.testing.assert_allclose(weighted.sumw2[1:7], [0, 6, 9, 0, 0, 1])
+
+    with pytest.raises(TypeError):
+        plain += weighted
+
+
+def test_values_on_edges():
+    hist = histogram.Histogram1D(100, 0.0, 2.0)
+    values = np.concatenate([hist.edges[:-1], [0.58, 1.16, 0.58, np.nextafter(1.16, 0.0)]])
+    hist.fill(values)
+
+    np.testing.assert_array_equal(hist.counts, np.histogram(values, bins=100, range=(0.0, 2.0))[0])
+
+    # the upper edge and nan are outside the bins
+    np.testing.assert_array_equal(hist.binIndex([-0.5, 2.0, np.nan]), [0, 101, 102])
@@ -0,0 +1,46 @@
+#! /usr/bin/env python3
+
+'''
+test_latticeWalk.py has pytest tests of the vectorized lattice random walks of latticeWalk.py
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import numpy as np
+import latticeWalk
+
+
+def test_clamped_positions_match_step_by_step():
+    rng = np.random.default_rng(1)
+    for L in [1, 2, 3, 7]:
+        start = rng.integers(0, L, 20)
+        steps = rng.integers(0, 4, (20, 200))
+        positions = latticeWalk.clampedPositions(start, latticeWalk.directionX[steps], L)
+
+        for i in range(len(start)):
+            x = start[i]
+            for j in range(steps.shape[1]):
+                if 0 <= x + latticeWalk.directionX[steps[i, j]] < L:
+                    x += latticeWalk.directionX[steps[i, j]]
+                assert positions[i, j] == x
+
+
+def test_paths_stay_on_the_lattice():
+    L = 5
+    x, y = latticeWalk.walk(L, 1000, 50, seed=2, history=True, chunkSize=96)
+
+    assert x.shape == (50, 1001)
+    assert np.all((x >= 0) & (x < L) & (y >= 0) & (y < L))
+    # every step moves one site up, down, left or right, rejected steps aren't counted
+    assert np.all(np.abs(np.diff(x, axis=1)) + np.abs(np.diff(y, axis=1)) == 1)
+
+
+def test_final_positions_match_paths():
+    first = latticeWalk.walk(11, 300, 40, seed=3, history=True, chunkSize=64)
+    last = latticeWalk.walk(11, 300, 40, seed=3, chunkSize=64)
+
+    # with these sizes every particle can reach an edge in a chunk, so both draw the same random numbers
+    np.testing.assert_array_equal(first[0][:, -1], last[0])
+    np.testing.assert_array_equal(first[1][:, -1], last[1])
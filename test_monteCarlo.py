@@ -0,0 +1,105 @@
+#! /usr/bin/env python3
+
+'''
+test_monteCarlo.py has pytest tests of the Monte Carlo integrator of monteCarlo.py
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import math
+import numpy as np
+import pytest
+import monteCarlo
+
+
+def withinSphere(points, dim):
+    return (np.sum(points**2, axis=1) <= 1.0).astype(np.float64)
+
+
+def spheres(points, dim):
+    # inside the sphere of every number of dimensions from 0 to dim, column d is the first d coordinates
+    radius = np.concatenate([np.zeros((len(points), 1)), np.cumsum(points**2, axis=1)], axis=1)
+    return (radius <= 1.0).astype(np.float64)
+
+
+def squares(points, dim):
+    return np.sum(points**2, axis=1)
+
+
+def sphereVolume(dim):
+    return math.pi**(dim / 2) / math.gamma(dim / 2 + 1)
+
+
+def test_stratified_removes_variance_along_the_strata():
+    # x^2 changes a lot along the stratified first axis, the strata take out most of its variance
+    lim = [[0.0, 1.0]] * 2
+    uniform = monteCarlo.integrate(squares, 2, lim, 1 << 16, seed=1)
+    stratified = monteCarlo.integrate(squares, 2, lim, 1 << 16, seed=1, method='stratified')
+
+    assert abs(stratified[0] - 2.0 / 3.0) < 4 * stratified[1]
+    assert stratified[2].pointsPerValue > 1
+    assert stratified[2].variancePerPoint < 0.2 * uniform[2].variancePerPoint
+
+
+def test_importance_sphere_10d():
+    lim = [[-1.0, 1.0]] * 10
+    uniform = monteCarlo.integrate(withinSphere, 10, lim, 1 << 18, seed=2)
+    importance = monteCarlo.integrate(withinSphere, 10, lim, 1 << 18, seed=2, method='importance')
+
+    assert abs(importance[0] - sphereVolume(10)) < 4 * importance[1]
+    assert importance[2].variancePerPoint < uniform[2].variancePerPoint / 20
+
+
+@pytest.mark.parametrize('method', monteCarlo.methods)
+def test_checkpoints_in_requested_order(method):
+    lim = [[-1.0, 1.0]] * 3
+    checkpoints = [1 << 16, 1 << 14, 1 << 15]
+    results = monteCarlo.integrateCheckpoints(withinSphere, 3, lim, checkpoints, seed=3, method=method)
+
+    # the errors come back in the order asked for and shrink with more points
+    points = [stats.points for I, sigma, stats in results]
+    assert points[1] < points[2] < points[0]
+    assert results[0][1] < results[1][1]
+
+    # the last checkpoint uses the same points as integrating with that many points, except for importance
+    # sampling, which draws two arrays per block so the blocks cut at the checkpoints give it different points
+    whole = monteCarlo.integrate(withinSphere, 3, lim, 1 << 16, seed=3, method=method)
+    if method != 'importance':
+        assert np.isclose(results[0][0], whole[0], rtol=1e-12) and np.isclose(results[0][1], whole[1], rtol=1e-9)
+    for I, sigma, stats in results:
+        assert abs(I - sphereVolume(3)) < 5 * sigma
+
+
+@pytest.mark.parametrize('method', ['sobol', 'halton'])
+def test_quasi_random_beats_random(method):
+    lim = [[0.0, 1.0]] * 4
+    quasi = monteCarlo.integrateCheckpoints(squares, 4, lim, [1 << 12, 1 << 16], seed=4, method=method)
+    uniform = monteCarlo.integrate(squares, 4, lim, 1 << 16, seed=4)
+
+    # the error of the scrambled copies falls faster than 1 / sqrt(N) for a smooth integrand
+    assert abs(quasi[1][0] - 4.0 / 3.0) < 5 * quasi[1][1]
+    assert quasi[0][1] / quasi[1][1] > 4 * 1.5
+    assert quasi[1][1] < uniform[1] / 10
+
+
+def test_sweep_matches_sphere_volumes():
+    lim = [[-1.0, 1.0]] * 6
+    volumes, errors, stats = monteCarlo.integrateSweep(spheres, 6, lim, 1 << 18, seed=5)
+
+    exact = np.array([sphereVolume(dim) for dim in range(7)])
+    assert volumes[0] == 1.0 and errors[0] == 0.0
+    assert np.all(np.abs(volumes - exact) <= 4 * errors + 1e-12)
+
+
+def test_workers_with_nested_integrand():
+    # a nested function can't be sent to the workers, it runs in this process with the same streams instead
+    def nested(points, dim):
+        return withinSphere(points, dim)
+
+    lim = [[-1.0, 1.0]] * 3
+    forked = monteCarlo.integrate(withinSphere, 3, lim, 1 << 17, seed=6, workers=2, blockSize=1 << 14)
+    serial = monteCarlo.integrate(nested, 3, lim, 1 << 17, seed=6, workers=2, blockSize=1 << 14)
+
+    assert forked[0] == serial[0] and forked[1] == serial[1]
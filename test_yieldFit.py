@@ -0,0 +1,73 @@
+#! /usr/bin/env python3
+
+'''
+test_yieldFit.py has pytest tests of the batched Breit-Wigner fits of yieldFit.py
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import numpy as np
+import yieldFit
+
+edges = np.linspace(0.3, 1.4, 56)
+
+
+def peakCounts(rng, signal, background):
+    fractions = np.diff(np.arctan(2.0 * (edges - yieldFit.rhoMass) / yieldFit.rhoWidth)) / np.pi
+    return rng.poisson(background + signal * fractions).astype(np.float64)
+
+
+def test_peak_slice():
+    rng = np.random.default_rng(1)
+    result = yieldFit.fitSlices(peakCounts(rng, 3000.0, 200.0)[np.newaxis], edges)
+
+    assert result['converged'][0]
+    assert abs(result['yield'][0] - 3000.0) < 4 * result['yield_error'][0]
+    assert abs(result['mass'][0] - yieldFit.rhoMass) < 4 * result['mass_error'][0]
+
+
+def test_pure_background_slice():
+    rng = np.random.default_rng(2)
+    counts = peakCounts(rng, 0.0, 200.0)[np.newaxis]
+    result = yieldFit.fitSlices(counts, edges)
+
+    binWidth = np.max(np.diff(edges))
+    assert np.all(result['width'] >= binWidth - 1e-12)
+    assert np.all((result['mass'] >= edges[0]) & (result['mass'] <= edges[-1]))
+
+    # no peak, so the yield is compatible with 0 or its error isn't defined, never a tiny error on a huge yield
+    for i in range(len(counts)):
+        error = result['yield_error'][i]
+        assert np.isnan(error) or abs(result['yield'][i]) < 4 * error + 1e-6
+        if not np.isnan(error):
+            assert error > 0.1
+
+
+def test_flat_slice_mass_undetermined():
+    # without a peak the mass isn't determined, so its error is nan or larger than the fit range, not a tiny number
+    counts = np.full((1, len(edges) - 1), 100.0)
+    result = yieldFit.fitSlices(counts, edges)
+
+    assert abs(result['yield'][0]) < 4 * result['yield_error'][0]
+    massError = result['mass_error'][0]
+    assert np.isnan(massError) or massError > edges[-1] - edges[0]
+
+
+def test_empty_slice():
+    # slices with too few bins with counts to fit are not converged and every value is nan, the other slices are
+    # still fit
+    rng = np.random.default_rng(3)
+    sparse = np.zeros(len(edges) - 1)
+    sparse[[10, 20, 30]] = 5.0
+    counts = np.array([np.zeros(len(edges) - 1), peakCounts(rng, 3000.0, 200.0), sparse])
+    result = yieldFit.fitSlices(counts, edges)
+
+    assert list(result['converged']) == [False, True, False]
+    for name in ['yield', 'yield_error', 'mass', 'width', 'deviance']:
+        assert np.all(np.isnan(result[name][[0, 2]]))
+        assert not np.isnan(result[name][1])
+
+    parallel = yieldFit.fitSlicesParallel(np.repeat(counts, 2, axis=0), edges, workers=2, minSlices=1)
+    assert list(parallel['converged']) == [False, False, True, True, False, False]
@@ -0,0 +1,337 @@
+#! /usr/bin/env python3
+
+'''
+yieldFit.py is a python module that extracts the yield of a resonance (ie the rho(770) in the pi+ pi- mass) from
+histograms that were already filled (see histogram.py). every slice of a kinematic variable is one row of counts,
+and all the slices are fit at once to a Breit-Wigner plus a polynomial background by minimizing the binned Poisson
+likelihood. the likelihood, its derivatives and the fit steps are evaluated for every slice together with batched
+numpy linear algebra, and large numbers of slices are split between worker processes. the yields are also found
+by sideband subtraction, which doesn't depend on the shape of the signal
+
+Janiris Rodriguez
+PHZ 4151C
+Oct 18, 2026
+'''
+
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+rhoMass = 0.775         # mass of the rho(770) in GeV, starting value of the fits
+rhoWidth = 0.149        # width of the rho(770) in GeV
+
+# names of the fit parameters in order, the background polynomial coefficients come after these
+signalParameters = ['yield', 'mass', 'width']
+
+
+def breitWignerFractions(edges, mass, width):
+    '''
+        fraction of a (non-relativistic) Breit-Wigner in every bin and its derivatives, found from the integral
+        atan(2 (m - mass) / width) / pi at the bin edges so narrow peaks in wide bins are still right
+        input:
+            edges (1-d array of floats): bin edges
+            mass, width (1-d arrays of floats): Breit-Wigner of every slice
+        returns:
+            fractions, derivatives with respect to mass and width, each with shape (slices, bins)
+    '''
+
+    u = 2.0 * (edges[np.newaxis, :] - mass[:, np.newaxis]) / width[:, np.newaxis]
+    slope = 1.0 / (np.pi * (1.0 + u**2))
+
+    fractions = np.diff(np.arctan(u), axis=1) / np.pi
+    dMass = -np.diff(slope, axis=1) * 2.0 / width[:, np.newaxis]
+    dWidth = -np.diff(slope * u, axis=1) / width[:, np.newaxis]
+
+    return fractions, dMass, dWidth
+
+
+def polynomialIntegrals(edges, degree):
+    '''
+        integral of every power of t over every bin, where t goes from -1 to 1 over the fit range, so the background
+        is linear in its coefficients
+        returns:
+            2-d array with shape (degree + 1, bins)
+    '''
+
+    halfRange = 0.5 * (edges[-1] - edges[0])
+    t = (edges - 0.5 * (edges[-1] + edges[0])) / halfRange
+    powers = np.arange(1, degree + 2)[:, np.newaxis]
+
+    return halfRange * np.diff(t[np.newaxis, :]**powers, axis=1) / powers
+
+
+def expectedCounts(parameters, edges, background):
+    '''
+        expected counts of the signal plus background in every bin, and their derivatives with respect to every
+        parameter
+        input:
+            parameters (2-d array of floats): yield, mass, width and the polynomial coefficients of every slice
+            edges (1-d array of floats): bin edges
+            background (2-d array of floats): polynomialIntegrals of the bins
+        returns:
+            expected counts with shape (slices, bins), and the jacobian with shape (slices, bins, parameters)
+    '''
+
+    signal, mass, width = parameters[:, 0], parameters[:, 1], parameters[:, 2]
+    fractions, dMass, dWidth = breitWignerFractions(edges, mass, width)
+
+    expected = signal[:, np.newaxis] * fractions + np.matmul(parameters[:, 3:], background)
+
+    jacobian = np.empty(expected.shape + (parameters.shape[1],))
+    jacobian[..., 0] = fractions
+    jacobian[..., 1] = signal[:, np.newaxis] * dMass
+    jacobian[..., 2] = signal[:, np.newaxis] * dWidth
+    jacobian[..., 3:] = background.T[np.newaxis]
+
+    return expected, jacobian
+
+
+def negativeLogLikelihood(counts, expected):
+    '''
+        binned Poisson negative log likelihood of every slice (without the terms that only depend on the counts),
+        infinite for a slice with an expected count that isn't positive
+    '''
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = expected - counts * np.log(expected)
+    result = np.sum(terms, axis=1)
+    result[np.any(expected <= 0, axis=1)] = np.inf
+
+    return result
+
+
+def fitSlices(counts, edges, degree=2, mass=rhoMass, width=rhoWidth, iterations=100, tolerance=1e-6):
+    '''
+        fits every slice to a Breit-Wigner plus a polynomial with a Levenberg-Marquardt fit of the Poisson
+        likelihood, every iteration is done for all the slices at once
+        input:
+            counts (2-d array of floats): counts with shape (slices, bins)
+            edges (1-d array of floats): bin edges of the fit range
+            degree (int): degree of the background polynomial
+            mass, width (floats): starting values of the Breit-Wigner
+            iterations (int): largest number of iterations
+            tolerance (float): the fit of a slice has converged once an iteration changes its likelihood by less
+                               than this
+        returns:
+            dictionary with the fitted parameters of every slice, their errors ('yield_error' etc), the
+            -2 log likelihood ratio to the data ('deviance') and whether each fit converged. the errors are nan for
+            a slice whose Fisher information can't be inverted (ie a slice without a peak, where the mass and width
+            aren't determined). a slice with fewer bins with counts than there are parameters (ie an empty slice)
+            isn't fit, every value is nan and it is not converged
+    '''
+
+    counts = np.asarray(counts, dtype=np.float64)
+    numSlices, numBins = counts.shape
+    numParameters = len(signalParameters) + degree + 1
+    names = signalParameters + ['background%d' % k for k in range(degree + 1)]
+
+    # slices that can't determine every parameter are left out of the fit
+    usable = np.count_nonzero(counts > 0, axis=1) >= numParameters
+    if not np.all(usable):
+        result = {}
+        for name in names:
+            result[name] = np.full(numSlices, np.nan)
+            result[name + '_error'] = np.full(numSlices, np.nan)
+        result['deviance'] = np.full(numSlices, np.nan)
+        result['converged'] = np.zeros(numSlices, dtype=bool)
+
+        if np.any(usable):
+            fitted = fitSlices(counts[usable], edges, degree, mass, width, iterations, tolerance)
+            for name in result:
+                result[name][usable] = fitted[name]
+
+        return result
+
+    background = polynomialIntegrals(edges, degree)
+
+    # the width can't be narrower than a bin, otherwise a slice without a peak fits a spike in one bin, and the
+    # peak has to stay inside the fit range
+    minWidth = np.max(np.diff(edges))
+
+    # start with a third of the counts in the peak and the rest flat
+    total = np.sum(counts, axis=1)
+    parameters = np.zeros((numSlices, numParameters))
+    parameters[:, 0] = total / 3.0
+    parameters[:, 1] = mass
+    parameters[:, 2] = max(width, minWidth)
+    parameters[:, 3] = np.maximum(total - parameters[:, 0], 1.0) / (edges[-1] - edges[0])
+
+    damping = np.full(numSlices, 1e-3)
+    expected, jacobian = expectedCounts(parameters, edges, background)
+    likelihood = negativeLogLikelihood(counts, expected)
+    converged = np.zeros(numSlices, dtype=bool)
+    stalled = np.zeros(numSlices, dtype=bool)     # fits that stopped without converging
+    identity = np.eye(numParameters)
+
+    for i in range(iterations):
+        active = ~(converged | stalled)
+        if not np.any(active):
+            break
+
+        # gradient and Fisher information of the likelihood, J^T (1 - n / mu) and J^T diag(1 / mu) J
+        weights = 1.0 / np.maximum(expected[active], 1e-12)
+        gradient = np.einsum('sbp,sb->sp', jacobian[active], 1.0 - counts[active] * weights)
+        information = np.einsum('sbp,sb,sbq->spq', jacobian[active], weights, jacobian[active])
+
+        diagonal = np.diagonal(information, axis1=1, axis2=2)
+        damped = information + damping[active, np.newaxis, np.newaxis] * diagonal[:, :, np.newaxis] * identity
+        step = np.linalg.solve(damped + 1e-12 * identity, -gradient[..., np.newaxis])[..., 0]
+
+        trial = parameters[active] + step
+        trial[:, 1] = np.clip(trial[:, 1], edges[0], edges[-1])
+        trial[:, 2] = np.maximum(trial[:, 2], minWidth)
+        trialExpected, trialJacobian = expectedCounts(trial, edges, background)
+        trialLikelihood = negativeLogLikelihood(counts[active], trialExpected)
+
+        # slices whose likelihood went down take the step and trust it more, the others damp it more
+        better = trialLikelihood < likelihood[active]
+        index = np.flatnonzero(active)
+        accepted = index[better]
+        change = likelihood[accepted] - trialLikelihood[better]
+
+        parameters[accepted] = trial[better]
+        expected[accepted] = trialExpected[better]
+        jacobian[accepted] = trialJacobian[better]
+        likelihood[accepted] = trialLikelihood[better]
+        damping[accepted] = np.maximum(damping[accepted] / 10.0, 1e-9)
+        damping[index[~better]] *= 10.0
+
+        # only a step that changes the likelihood by less than the tolerance counts as converged, a fit that can't
+        # find a better step even with huge damping has stalled
+        converged[accepted[change < tolerance]] = True
+        stalled[index[~better][damping[index[~better]] > 1e10]] = True
+
+    # errors from the inverse of the Fisher information at the minimum, nan where it is singular
+    weights = 1.0 / np.maximum(expected, 1e-12)
+    information = np.einsum('sbp,sb,sbq->spq', jacobian, weights, jacobian)
+    errors = np.full((numSlices, numParameters), np.nan)
+    # the condition is found after scaling every parameter to unit information, so only real degeneracies (not
+    # the different sizes of the parameters) count as singular
+    diagonal = np.diagonal(information, axis1=1, axis2=2)
+    regular = np.all(np.isfinite(information), axis=(1, 2)) & np.all(diagonal > 0, axis=1)
+    scale = 1.0 / np.sqrt(diagonal[regular])
+    scaled = information[regular] * scale[:, :, np.newaxis] * scale[:, np.newaxis, :]
+    regular[regular] = np.linalg.cond(scaled) < 1e12
+    if np.any(regular):
+        variances = np.diagonal(np.linalg.inv(information[regular]), axis1=1, axis2=2)
+        with np.errstate(invalid='ignore'):
+            errors[regular] = np.where(variances >= 0, np.sqrt(variances), np.nan)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        logRatio = np.where(counts > 0, counts * np.log(counts / expected), 0.0)
+    deviance = 2.0 * np.sum(expected - counts + logRatio, axis=1)
+
+    result = {}
+    for k, name in enumerate(names):
+        result[name] = parameters[:, k]
+        result[name + '_error'] = errors[:, k]
+    result['deviance'] = deviance
+    result['converged'] = converged
+
+    return result
+
+
+def fitSlicesParallel(counts, edges, degree=2, workers=None, minSlices=64, **options):
+    '''
+        fitSlices split between worker processes, each worker fits a block of slices with the batched fit. the
+        workers are forked so this also works when called from a script without a main guard, where forking isn't
+        available every slice is fit in this process
+        input:
+            counts (2-d array of floats): counts with shape (slices, bins)
+            edges (1-d array of floats): bin edges of the fit range
+            degree (int): degree of the background polynomial
+            workers (int): number of worker processes, uses every core if None
+            minSlices (int): smallest number of slices given to a worker, fewer slices are fit in this process
+            options: passed on to fitSlices
+        returns:
+            same as fitSlices
+    '''
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(counts) // minSlices))
+
+    if workers == 1 or 'fork' not in multiprocessing.get_all_start_methods():
+        return fitSlices(counts, edges, degree, **options)
+
+    blocks = np.array_split(np.asarray(counts), workers)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as pool:
+        futures = [pool.submit(fitSlices, block, edges, degree, **options) for block in blocks]
+        results = [future.result() for future in futures]
+
+    return {name: np.concatenate([result[name] for result in results]) for name in results[0]}
+
+
+def sidebandYields(counts, edges, signal=(0.62, 0.92), sidebands=((0.42, 0.57), (0.97, 1.12))):
+    '''
+        yield in a signal window minus the background under it, estimated from sidebands on either side assuming
+        the background is linear, for every slice at once
+        input:
+            counts (2-d array of floats): counts with shape (slices, bins)
+            edges (1-d array of floats): bin edges
+            signal (tuple of floats): low and high edge of the signal window
+            sidebands (tuple of tuples of floats): low and high edge of each sideband
+        returns:
+            yields and their errors, one for each slice
+    '''
+
+    centers = 0.5 * (edges[1:] + edges[:-1])
+    inSignal = (centers >= signal[0]) & (centers <= signal[1])
+    inSidebands = np.zeros(len(centers), dtype=bool)
+    for low, high in sidebands:
+        inSidebands |= (centers >= low) & (centers <= high)
+
+    # the sideband counts are scaled by the ratio of the number of bins in the signal window and the sidebands
+    scale = np.count_nonzero(inSignal) / max(np.count_nonzero(inSidebands), 1)
+    signalCounts = np.sum(counts[:, inSignal], axis=1)
+    sidebandCounts = np.sum(counts[:, inSidebands], axis=1)
+
+    return signalCounts - scale * sidebandCounts, np.sqrt(signalCounts + scale**2 * sidebandCounts)
+
+
+def yieldTable(hist, fitRange=(0.3, 1.4), degree=2, workers=None, **options):
+    '''
+        fits and sideband subtracts every slice of a histogram
+        input:
+            hist (Histogram1D or Histogram2D): mass histogram, or 2-d histogram with the slices along x and the mass
+                                                along y
+            fitRange (tuple of floats): range of the mass fit, only whole bins inside it are used
+            degree (int): degree of the background polynomial
+            workers (int): number of worker processes for the fits, uses every core if None
+            options: passed on to fitSlices and sidebandYields
+        returns:
+            dictionary of column name to array, one row for each slice
+    '''
+
+    if hasattr(hist, 'xEdges'):
+        counts, edges = hist.counts, hist.yEdges
+        sliceEdges = hist.xEdges
+    else:
+        counts, edges = hist.counts[np.newaxis, :], hist.edges
+        sliceEdges = hist.edges[[0, -1]]
+
+    first = np.searchsorted(edges, fitRange[0] - 1e-9)
+    last = np.searchsorted(edges, fitRange[1] + 1e-9, side='right') - 1
+    fitOptions = {name: value for name, value in options.items() if name not in ['signal', 'sidebands']}
+    sidebandOptions = {name: value for name, value in options.items() if name in ['signal', 'sidebands']}
+
+    table = {'slice_low': sliceEdges[:-1], 'slice_high': sliceEdges[1:]}
+    table.update(fitSlicesParallel(counts[:, first:last], edges[first:last + 1], degree, workers, **fitOptions))
+    table['sideband_yield'], table['sideband_yield_error'] = sidebandYields(counts, edges, **sidebandOptions)
+
+    return table
+
+
+def printYieldTable(table):
+    '''
+        prints the fitted and sideband subtracted yields of every slice
+    '''
+
+    print('%10s %10s %12s %10s %10s %10s %12s %10s %5s' % ('Low', 'High', 'Fit Yield', 'Error', 'Mass', 'Width',
+                                                          'Sideband', 'Error', 'Conv'))
+    for i in range(len(table['yield'])):
+        print('%10.3f %10.3f %12.1f %10.1f %10.4f %10.4f %12.1f %10.1f %5s' % (
+            table['slice_low'][i], table['slice_high'][i], table['yield'][i], table['yield_error'][i],
+            table['mass'][i], table['width'][i], table['sideband_yield'][i], table['sideband_yield_error'][i],
+            'yes' if table['converged'][i] else 'no'))